@@ -0,0 +1,176 @@
+"""Benchmarks of the game's hot paths.
+
+Timings depend on the machine, so the baseline is not kept in the repository. Save one on the machine
+that checks for regressions, before a change, and compare against it after the change:
+    python -m GameOfBlackjack.benchmark --save      (writes BASELINE, benchmark_baseline.json next to this file)
+    python -m GameOfBlackjack.benchmark --baseline  (exits with 1 if a benchmark got slower than --tolerance)
+Both options take another path too.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import timeit
+from GameOfBlackjack.blackjack import Hand, Player, GameController
+from GameOfBlackjack.deck import Deck, Card, CARDS
+from GameOfBlackjack.game_view import FancyView
+from GameOfBlackjack.strategy import Karmoai
+
+BENCHMARKS = {}
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+
+def benchmark(name: str):
+    """Register a benchmark.
+
+    The decorated function prepares its data and returns (operations, run), where run does the
+    given amount of operations once.
+    """
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+def hand_corpus() -> list:
+    """Get card lists of all two card hands and many three and four card hands."""
+    corpus = [[CARDS[a], CARDS[b]] for a in range(13) for b in range(13)]
+    corpus += [[CARDS[a], CARDS[b], CARDS[c]] for a in range(13) for b in range(13) for c in range(0, 13, 3)]
+    corpus += [[CARDS[a], CARDS[b], CARDS[c], CARDS[d]] for a in range(0, 13, 2) for b in range(1, 6)
+               for c in range(1, 6) for d in range(0, 13, 4)]
+    return corpus
+
+
+def _house() -> Hand:
+    """Get house hand with the hole card down and a six up."""
+    return Hand([Card(9, True), CARDS[5]])
+
+
+@benchmark("hand.add_card")
+def bench_hand_add_card():
+    """Build hands card by card."""
+    corpus = hand_corpus()
+    return sum(len(cards) for cards in corpus), lambda: [Hand(cards) for cards in corpus]
+
+
+@benchmark("hand.score+is_blackjack+can_split")
+def bench_hand_queries():
+    """Read hand totals and flags."""
+    hands = [Hand(cards) for cards in hand_corpus()]
+    return len(hands), lambda: [(hand.score, hand.is_blackjack, hand.can_split) for hand in hands]
+
+
+def _bench_deal_shoe(decks_count: int):
+    """Shuffle and deal a whole shoe, per card."""
+    deck = Deck(decks_count, True)
+
+    def run():
+        deck.shuffle()
+        while deck.remaining:
+            deck.draw_card()
+    return deck.remaining, run
+
+
+def _bench_new_deck(decks_count: int):
+    """Build a shuffled deck."""
+    return 1, lambda: Deck(decks_count, True)
+
+
+for _decks in range(1, 9):
+    benchmark(f"deck.deal_shoe[{_decks}]")(lambda decks=_decks: _bench_deal_shoe(decks))
+    benchmark(f"deck.new[{_decks}]")(lambda decks=_decks: _bench_new_deck(decks))
+
+
+@benchmark("karmoai.play_move")
+def bench_karmoai_play_move():
+    """Decide moves of many hands against a six."""
+    bot = Karmoai([], _house(), 6)
+    hands = [Hand(cards) for cards in hand_corpus()]
+    return len(hands), lambda: [bot.play_move(hand) for hand in hands]
+
+
+@benchmark("karmoai.on_card_drawn")
+def bench_karmoai_on_card_drawn():
+    """Show every card to a bot."""
+    bot = Karmoai([], _house(), 6)
+    return len(CARDS), lambda: [bot.on_card_drawn(card) for card in CARDS]
+
+
+@benchmark("view.show_table[8x2]")
+def bench_show_table():
+    """Render a table of eight players with two hands each."""
+    players = [Player(f"Player {seat}", None, 1000) for seat in range(8)]
+    for seat, player in enumerate(players):
+        player.hands = [Hand([CARDS[seat], CARDS[seat + 13], CARDS[seat + 26], CARDS[seat + 39]]) for _ in range(2)]
+    house = _house()
+    view = FancyView()
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            view.show_table(players, house, players[0].hands[0])
+    return 1, run
+
+
+@benchmark("controller.play_round[6 decks, 5 bots]")
+def bench_play_round():
+    """Play headless rounds."""
+    controller = GameController(decks_count=6, buy_in_step=0, penetration=0.75)
+    controller.seat_bots([Karmoai] * 5, 10 ** 12)
+    rounds = 200
+
+    def run():
+        for _ in range(rounds):
+            controller.play_round()
+    return rounds, run
+
+
+def run_benchmarks(names=None, repeat: int = 5) -> dict:
+    """Run benchmarks, get best nanoseconds per operation by name."""
+    results = {}
+    for name, prepare in BENCHMARKS.items():
+        if names and not any(part in name for part in names):
+            continue
+        operations, run = prepare()
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+        results[name] = {"ns_per_op": best / operations * 1e9, "ops": operations}
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    """Get (name, ratio) of benchmarks slower than baseline by more than tolerance."""
+    regressions = []
+    for name, result in results.items():
+        if name in baseline:
+            ratio = result["ns_per_op"] / baseline[name]["ns_per_op"]
+            if ratio > 1 + tolerance:
+                regressions.append((name, ratio))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time the game's hot paths.")
+    parser.add_argument("names", nargs="*", help="run only benchmarks containing one of these")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", nargs="?", const=BASELINE, help="write results as JSON to this file, the baseline "
+                                                                   "file if not given")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE, help="compare against results saved earlier, in the "
+                                                                      "baseline file if not given")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, 0.2 is 20%%")
+    args = parser.parse_args()
+    results = run_benchmarks(args.names, args.repeat)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    for name, result in results.items():
+        change = f"{result['ns_per_op'] / baseline[name]['ns_per_op'] - 1: >+8.1%}" if name in baseline else ''
+        print(f"{name: <45}{result['ns_per_op']: >14.1f} ns/op {change}")
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    regressions = compare(results, baseline, args.tolerance)
+    for name, ratio in regressions:
+        print(f"REGRESSION {name}: {ratio:.2f}x baseline", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
@@ -1,88 +1,120 @@
 """Blackjack."""
-import importlib
-import os
-import pkgutil
+from enum import Enum
+from random import Random
+from time import perf_counter
 from GameOfBlackjack.game_view import GameView, FancyView, Move
 from student_strategy import Strategy, HumanStrategy, NotSoDumbAI
-from GameOfBlackjack.deck import Deck, Card
+from GameOfBlackjack.deck import Deck, Card, ShoeTracker, ACE
+from GameOfBlackjack.strategy import EVENTS, CARD_DRAWN, CARDS_DEALT, GAME_END, SHUFFLE
+from GameOfBlackjack.history import HistoryWriter, ROUND, CARD, MOVE, PAYOUT, HOUSE, MOVE_CODES
+from GameOfBlackjack.registry import STRATEGIES
+from GameOfBlackjack.ledger import Ledger, to_units, to_coins
+from GameOfBlackjack.metrics import Metrics, ROUNDS, CARDS_DRAWN, CARD_DRAWN_CALLS, PHASE_SECONDS, PLAY_MOVE_SECONDS, \
+    CARD_DRAWN_SECONDS
+
+
+class Outcome(Enum):
+    """Hand outcomes."""
+    BLACKJACK = "BLACKJACK"
+    WIN = "WIN"
+    PUSH = "PUSH"
+    LOSE = "LOSE"
+    BUST = "BUST"
+    SURRENDER = "SURRENDER"
+
+
+OUTCOME_CODES = {outcome: code for code, outcome in enumerate(Outcome)}
+# Metric labels of the phases of a round.
+PHASES = {phase: (("phase", phase),) for phase in
+          ("give_players_cards", "play_blackjack", "house", "give_money_to_players", "render")}
 
 
 class Hand:
-    """Hand."""
+    """Hand.
+
+    Totals and flags are kept up to date as cards are added, so reading them is O(1).
+    Cards must be added through add_card or double_down, not appended to cards directly.
+    GameController reuses hands from round to round, so they must not be kept after the round.
+    """
+
+    __slots__ = ("cards", "stake", "is_double_down", "is_surrendered", "hard_score", "aces", "score", "is_soft_hand",
+                 "is_blackjack", "can_split")
 
     def __init__(self, cards: list = None):
         """Init."""
-        self.cards = [] if cards is None else cards
+        self.cards = []
+        # Units staked on the hand (see ledger), kept when the hand is split.
+        self.stake = 0
+        self.clear()
+        for card in [] if cards is None else cards:
+            self.add_card(card)
+
+    def clear(self) -> None:
+        """Remove all cards and reset the hand."""
+        self.cards.clear()
         self.is_double_down, self.is_surrendered = False, False
+        self.hard_score, self.aces, self.score = 0, 0, 0
+        self.is_soft_hand, self.is_blackjack, self.can_split = False, False, False
 
     def add_card(self, card: Card) -> None:
         """Add card to hand."""
         self.cards.append(card)
+        if card.rank == ACE:
+            self.aces += 1
+            self.hard_score += 1
+            self.is_soft_hand = True
+        else:
+            self.hard_score += card.points
+        self.score = self.hard_score + 10 if self.aces and self.hard_score < 12 else self.hard_score
+        two_cards = len(self.cards) == 2
+        self.is_blackjack = two_cards and self.score == 21
+        self.can_split = two_cards and self.cards[0].rank == card.rank
 
     def double_down(self, card: Card) -> None:
         """Double down."""
         self.add_card(card)
         self.is_double_down = True
 
-    def split(self):
-        """Split hand."""
+    def reset(self) -> None:
+        """Clear hand and its stake for reuse."""
+        self.clear()
+        self.stake = 0
+
+    def split(self, hand: "Hand" = None):
+        """Split hand, moving the first card to the given empty hand or a new one."""
         if self.can_split:
-            new_hand = self.cards[:1]
-            self.cards = self.cards[1:]
-            return Hand(new_hand)
+            first, second = self.cards
+            self.clear()
+            self.add_card(second)
+            hand = Hand() if hand is None else hand
+            hand.add_card(first)
+            return hand
         raise ValueError("Invalid hand to split!")
 
-    @property
-    def can_split(self) -> bool:
-        """Check if hand can be split."""
-        if len(self.cards) == 2 and self.cards[0].value == self.cards[1].value:
-            return True
-        return False
-
-    @property
-    def is_blackjack(self) -> bool:
-        """Check if is blackjack."""
-        return True if len(self.cards) == 2 and self.is_soft_hand and {card.value for card in self.cards} & {"JACK",
-                                                                                                             "10",
-                                                                                                             "QUEEN",
-                                                                                                             "KING"} else False
-
-    @property
-    def is_soft_hand(self):
-        """Check if is soft hand."""
-        return True if "ACE" in [card.value for card in self.cards] else False
-
-    @property
-    def score(self) -> int:
-        """Get score of hand."""
-        score = 0
-        ace_score = 0
-        for value in [card.value for card in self.cards]:
-            if value.isdigit():
-                score += int(value)
-            else:
-                if value != "ACE":
-                    score += 10
-                else:
-                    ace_score += 11
-        aces_in_hand = ace_score // 11
-        for x in range(aces_in_hand):
-            if score + ace_score < 22:
-                return score + ace_score
-            ace_score -= 10
-        return score + ace_score
-
 
 class Player:
-    """Player."""
+    """Player.
+
+    Coins are kept in chips, integer units of the ledger.
+    """
 
     def __init__(self, name: str, strategy: Strategy, coins: int = 100):
         """Init."""
         self.name = name
         self.strategy = strategy
-        self.coins = coins
+        self.chips = to_units(coins)
         self.hands = []
 
+    @property
+    def coins(self):
+        """Get coins."""
+        return to_coins(self.chips)
+
+    @coins.setter
+    def coins(self, coins) -> None:
+        """Set coins."""
+        self.chips = to_units(coins)
+
     def join_table(self):
         """Join table."""
         self.hands.append(Hand())
@@ -91,10 +123,10 @@ class Player:
         """Play move."""
         return self.strategy.play_move(hand)
 
-    def split_hand(self, hand: Hand) -> None:
-        """Split hand."""
+    def split_hand(self, hand: Hand, new_hand: Hand = None) -> None:
+        """Split hand, into new_hand if given."""
         try:
-            self.hands.append(hand.split())
+            self.hands.append(hand.split(new_hand))
         except ValueError:
             pass
 
@@ -104,16 +136,48 @@ class GameController:
 
     PLAYER_START_COINS = 200
     BUY_IN_COST = 5
+    BUY_IN_STEP = 1
+    PENETRATION = 1.0
 
-    def __init__(self, view: GameView):
-        """Init."""
-        self.deck_ammount = view.ask_decks_count()
+    def __init__(self, view: GameView = None, decks_count: int = None, buy_in_step: int = BUY_IN_STEP,
+                 rng: Random = None, penetration: float = PENETRATION, history: HistoryWriter = None,
+                 shuffle_source=None, store=None, metrics: Metrics = None, deck: Deck = None):
+        """Init.
+
+        Without a view the controller runs headless: nothing is asked or rendered.
+        All randomness of the table (shuffling and bots) comes from rng.
+        With a history writer every round is recorded to it.
+        With a shuffle source (see shuffler.ShuffleSource) shoes are shuffled by it instead of rng.
+        With a store (see store.SessionStore) bankrolls and results are saved to it in batches.
+        With metrics, phases of every round, moves of every strategy and card fan-out are timed and counted.
+        A given deck (like online_deck.OnlineDeck) is dealt from instead of a local one.
+        """
+        self.deck_ammount = view.ask_decks_count() if decks_count is None else decks_count
         self.view = view
         self.house = Hand()
         self.players = []
-        self.deck = None
+        self.deck = deck
         self.playing_players = []
-        self.playing = True
+        self.playing = view is not None
+        self.buy_in_cost = GameController.BUY_IN_COST
+        self.buy_in_step = buy_in_step
+        self.round_results = []
+        self.ledger = Ledger(Outcome)
+        self.rng = Random() if rng is None else rng
+        self.penetration = penetration
+        self.shoe = ShoeTracker(self.deck_ammount)
+        # Shuffles so far, and the shuffle the house hole card was dealt after.
+        self.shuffles = 0
+        self.hole_card_shuffle = 0
+        self.subscribers = {event: [] for event in EVENTS}
+        self.dealt_cards = []
+        # Hands of earlier rounds, reset for reuse.
+        self.hand_pool = []
+        self.history = history
+        self.round_number = 0
+        self.shuffle_source = shuffle_source
+        self.store = store
+        self.metrics = metrics
 
     def start_game(self) -> None:
         """Start game."""
@@ -129,81 +193,147 @@ class GameController:
         for num in range(bots_amount):
             bot_names.append(self.view.ask_name(player_count))
             player_count += 1
-        self.deck = Deck(self.deck_ammount, True)
+        if self.deck is None:
+            self.deck = Deck(self.deck_ammount, True, self.rng, self.penetration, self.shuffle_source)
         self.players = [Player(name, HumanStrategy(self.players, self.house, self.deck_ammount, self.view),
                                GameController.PLAYER_START_COINS) for name in human_names]
         for ind, name in enumerate(bot_names):
             self.players.append(Player(name, NotSoDumbAI(self.players, self.house, self.deck_ammount),
                                            GameController.PLAYER_START_COINS))
+        for player in self.players:
+            player.strategy.shoe = self.shoe
 
+    def seat_bots(self, strategies: list, coins: int = PLAYER_START_COINS) -> None:
+        """Seat a bot for every strategy class, without asking anything from the view."""
+        self.house = Hand()
+        if self.deck is None:
+            self.deck = Deck(self.deck_ammount, True, self.rng, self.penetration, self.shuffle_source)
+        for ind, strategy in enumerate(strategies):
+            player = Player(f"{strategy.__name__} {ind}", strategy(self.players, self.house, self.deck_ammount), coins)
+            player.strategy.rng = self.rng
+            player.strategy.shoe = self.shoe
+            self.players.append(player)
 
     def play_round(self) -> None:
         """Play round."""
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.inc(ROUNDS)
+            start = perf_counter()
+        pool = self.hand_pool
         for player in self.playing_players:
-            player.hands = []
-        self.playing_players = []
-        self.house = Hand()
+            for hand in player.hands:
+                hand.reset()
+            pool += player.hands
+            player.hands.clear()
+        self.playing_players.clear()
+        self.house.reset()
+        self.round_number += 1
+        if self.deck.is_cut_card_reached:
+            self._shuffle()
         self.give_players_cards()
+        self._deliver_dealt_cards()
+        if self.history is not None:
+            self.history.write(ROUND, len(self.players), 0, 0, self.round_number, to_units(self.buy_in_cost))
+        if metrics is not None:
+            start = metrics.lap(PHASE_SECONDS, PHASES["give_players_cards"], start)
 
         # Play the game Blackjack.
         self.play_blackjack()
+        self._deliver_dealt_cards()
+        if metrics is not None:
+            start = metrics.lap(PHASE_SECONDS, PHASES["play_blackjack"], start)
         self.house.cards[0].top_down = False
+        # A hole card of a shoe shuffled away mid round is not in the tracked shoe.
+        if self.hole_card_shuffle == self.shuffles:
+            self.shoe.on_card_drawn(self.house.cards[0])
+            self._show_card(self.house.cards[0])
 
         while True:
             if self.house.score < 17 or self.house.is_soft_hand and self.house.score < 18:
                 self.house.add_card(self._draw_card())
             else:
                 break
+        self._deliver_dealt_cards()
+        if metrics is not None:
+            start = metrics.lap(PHASE_SECONDS, PHASES["house"], start)
         # Give money to suitable players.
         self.give_money_to_players()
+        # Raised before the store commits, so a resumed session plays the next round at the right buy in.
+        self.buy_in_cost += self.buy_in_step
+        if self.history is not None:
+            self._record_round()
+        if self.store is not None:
+            self.store.record_round(self)
+        if metrics is not None:
+            start = metrics.lap(PHASE_SECONDS, PHASES["give_money_to_players"], start)
         if self.playing:
-            FancyView.show_table(self.view, self.playing_players, self.house, self.house)
-        print(f"Buy in coset: {GameController.BUY_IN_COST}")
+            self._show_table(self.house)
+            print(f"Buy in coset: {self.buy_in_cost}")
 
     def give_players_cards(self):
+        stake = to_units(self.buy_in_cost)
         for player in self.players:
-            if player.coins >= GameController.BUY_IN_COST:
-                player.coins -= GameController.BUY_IN_COST
-                player.hands.append(Hand([self._draw_card()]))
+            if player.chips >= stake:
+                player.chips -= stake
                 self.playing_players.append(player)
+        self._subscribe()
+        pool = self.hand_pool
+        for player in self.playing_players:
+            hand = pool.pop() if pool else Hand()
+            hand.add_card(self._draw_card())
+            hand.stake = stake
+            player.hands.append(hand)
         for counter in range(2):
             for player in self.playing_players:
                 if counter:
                     player.hands[0].add_card(self._draw_card())
-            house_card = self._draw_card()
-            if not counter:
-                house_card.top_down = True
-            self.house.add_card(house_card)
+            self.house.add_card(self._draw_card(top_down=not counter))
 
     def play_blackjack(self):
         """Play blackjack with the players."""
-        GameController.BUY_IN_COST += 1
+        stake = to_units(self.buy_in_cost)
+        history = self.history
+        metrics = self.metrics
         for player in self.playing_players:
             hand_index = -1
             player.strategy.house = self.house
+            if history is not None:
+                seat = self.players.index(player)
+            if metrics is not None:
+                move_seconds = metrics.histogram(PLAY_MOVE_SECONDS, (("strategy", type(player.strategy).__name__),))
             for hand in player.hands:
                 hand_index += 1
                 while True:
                     if hand.score > 21 or hand.is_blackjack:
                         break
                     if self.playing:
-                        FancyView.show_table(self.view, self.playing_players, self.house, hand)
-                    move = player.play_move(hand)
+                        self._show_table(hand)
+                    if metrics is not None:
+                        start = perf_counter()
+                        move = player.play_move(hand)
+                        move_seconds.lap(start)
+                    else:
+                        move = player.play_move(hand)
+                    if history is not None:
+                        history.write(MOVE, seat, hand_index, MOVE_CODES[move], hand.score)
                     if move == Move.HIT:
                         hand.add_card(self._draw_card())
                     if move == Move.SPLIT and hand.can_split:
-                        if player.coins < GameController.BUY_IN_COST:
+                        if player.chips < stake:
                             hand.add_card(self._draw_card())
                         else:
-                            player.coins -= GameController.BUY_IN_COST
-                            player.split_hand(hand)
+                            player.chips -= stake
+                            player.split_hand(hand, self.hand_pool.pop() if self.hand_pool else None)
+                            player.hands[-1].stake = stake
                             player.hands[hand_index].add_card(self._draw_card())
                             player.hands[-1].add_card(self._draw_card())
                     if move == Move.DOUBLE_DOWN:
-                        if player.coins < GameController.BUY_IN_COST:
+                        if player.chips < stake:
                             hand.add_card(self._draw_card())
                             break
-                        player.coins -= GameController.BUY_IN_COST
+                        player.chips -= stake
+                        hand.stake += stake
                         hand.double_down(self._draw_card())
                         break
                     if move == Move.SURRENDER:
@@ -211,43 +341,108 @@ class GameController:
                         break
                     if move == Move.STAND:
                         break
-            player.strategy.on_game_end()
+            if GAME_END in player.strategy.EVENTS:
+                player.strategy.on_game_end()
     def give_money_to_players(self):
-        """People get their money."""
+        """People get their money.
+
+        All hands are settled in chips by the ledger, which keeps the stake of every hand.
+        Every settled hand is also recorded in round_results as (player, hand, outcome, payout in coins).
+        """
+        self.round_results = [(player, hand, outcome, to_coins(payout))
+                              for player, hand, stake, outcome, payout in
+                              self.ledger.settle(self.playing_players, self.house)]
+
+    def _record_round(self) -> None:
+        """Write final cards of every hand and the payouts of the round in chips to history."""
+        write = self.history.write
+        seats = {}
         for player in self.playing_players:
-            for hand in player.hands:
-                modifier = 1
-                if hand.is_double_down:
-                    modifier = 2
-                if hand.is_blackjack and not self.house.is_blackjack:
-                    player.coins += GameController.BUY_IN_COST * 2.5
-                elif hand.is_surrendered:
-                    player.coins += GameController.BUY_IN_COST * 0.5
-                elif hand.score > 21:
-                    pass
-                elif self.house.score > 21:
-                    player.coins += GameController.BUY_IN_COST * 2 * modifier
-                elif hand.score > self.house.score:
-                    player.coins += GameController.BUY_IN_COST * 2 * modifier
-                elif hand.score == self.house.score:
-                    player.coins += GameController.BUY_IN_COST * modifier
-
-    def _draw_card(self) -> Card:
-        """Draw card."""
-        card = self.deck.draw_card()
+            seats[player] = seat = self.players.index(player)
+            for hand_index, hand in enumerate(player.hands):
+                for card in hand.cards:
+                    write(CARD, seat, hand_index, card.id)
+        for card in self.house.cards:
+            write(CARD, HOUSE, 0, card.id)
+        hand_indexes = {}
+        for player, hand, stake, outcome, payout in self.ledger.entries:
+            hand_index = hand_indexes[player] = hand_indexes.get(player, -1) + 1
+            write(PAYOUT, seats[player], hand_index, OUTCOME_CODES[outcome], hand.score, payout)
+
+    def _draw_card(self, top_down: bool = False) -> Card:
+        """Draw card.
+
+        The shoe is shuffled between rounds once the cut card is out, or right away if it runs dry mid round.
+        """
+        if not self.deck.remaining:
+            self._shuffle()
+        card = self.deck.draw_card(top_down)
+        if top_down:
+            self.hole_card_shuffle = self.shuffles
+        else:
+            self.shoe.on_card_drawn(card)
+            self._show_card(card)
+        return card
+
+    def _show_card(self, card: Card) -> None:
+        """Show face up card to the strategies listening to cards, top down cards are shown when revealed."""
+        if self.metrics is not None:
+            self._timed_card_drawn(card)
+        else:
+            for strategy in self.subscribers[CARD_DRAWN]:
+                strategy.on_card_drawn(card)
+        if self.subscribers[CARDS_DEALT]:
+            self.dealt_cards.append(card)
+
+    def _show_table(self, hand: Hand) -> None:
+        """Render the table with given hand in turn."""
+        if self.metrics is not None:
+            start = perf_counter()
+            FancyView.show_table(self.view, self.playing_players, self.house, hand)
+            self.metrics.lap(PHASE_SECONDS, PHASES["render"], start)
+        else:
+            FancyView.show_table(self.view, self.playing_players, self.house, hand)
+
+    def _timed_card_drawn(self, card: Card) -> None:
+        """Show drawn card to the strategies listening to it, counting and timing the fan-out."""
+        metrics = self.metrics
+        subscribers = self.subscribers[CARD_DRAWN]
+        start = perf_counter()
+        for strategy in subscribers:
+            strategy.on_card_drawn(card)
+        metrics.lap(CARD_DRAWN_SECONDS, (), start)
+        metrics.inc(CARDS_DRAWN)
+        metrics.inc(CARD_DRAWN_CALLS, len(subscribers))
+
+    def _shuffle(self) -> None:
+        """Shuffle the shoe and start tracking it over."""
+        self.deck.shuffle()
+        self.shoe.reset()
+        self.shuffles += 1
         for player in self.players:
-            player.strategy.on_card_drawn(card)
-        if self.deck.remaining == 0:
-            self.deck = Deck(self.deck_ammount, True)
-        return self.deck.draw_card()
+            if SHUFFLE in player.strategy.EVENTS:
+                player.strategy.on_shuffle()
+
+    def _subscribe(self) -> None:
+        """Collect strategies of playing players by the events they listen to."""
+        for event, strategies in self.subscribers.items():
+            strategies[:] = [player.strategy for player in self.playing_players if event in player.strategy.EVENTS]
+
+    def _deliver_dealt_cards(self) -> None:
+        """Give cards dealt in the last phase of the round to strategies listening to them in bulk.
+
+        Cards are collected only while a strategy listens to them.
+        """
+        subscribers = self.subscribers[CARDS_DEALT]
+        if subscribers:
+            for strategy in subscribers:
+                strategy.on_cards_dealt(self.dealt_cards)
+            self.dealt_cards.clear()
 
     @staticmethod
-    def load_strategies() -> list:
-        """Load strategies."""
-        pkg_dir = os.path.dirname(__file__)
-        for (module_loader, name, is_pkg) in pkgutil.iter_modules([pkg_dir]):
-            importlib.import_module('.' + name, 'ex13_blackjack')
-        return list(filter(lambda x: x.__name__ != HumanStrategy.__name__, Strategy.__subclasses__()))
+    def load_strategies(names: list = None) -> list:
+        """Load bot strategies, all of the package or the given names, importing only the modules they are in."""
+        return STRATEGIES.load_bots() if names is None else [STRATEGIES.load(name) for name in names]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,110 @@
+"""Exact house outcome probabilities."""
+from functools import lru_cache
+from GameOfBlackjack.deck import CARD_RANKS, POINTS
+
+# Card categories by points, 2-10 -> 0-8 and ace -> 9, same as the upcard index of the strategy tables.
+CATEGORIES = 10
+ACE_CATEGORY = 9
+CATEGORY_HARD_POINTS = tuple(range(2, 11)) + (1,)
+RANK_CATEGORIES = tuple(POINTS[rank] - 2 for rank in range(len(POINTS)))
+
+# Final house results, the order of the probabilities in a result tuple.
+OUTCOMES = (17, 18, 19, 20, 21, "BLACKJACK", "BUST")
+BLACKJACK, BUST = 5, 6
+
+
+def composition(remaining_by_rank: list) -> tuple:
+    """Get card counts by category from counts by rank (deck.ShoeTracker.remaining)."""
+    counts = [0] * CATEGORIES
+    for rank, count in enumerate(remaining_by_rank):
+        counts[RANK_CATEGORIES[rank]] += count
+    return tuple(counts)
+
+
+def card_category(card) -> int:
+    """Get category of a card."""
+    return RANK_CATEGORIES[CARD_RANKS[card.id]]
+
+
+@lru_cache(maxsize=4096)
+def house_probabilities(counts: tuple, upcard: int) -> tuple:
+    """Get probabilities of house results (see OUTCOMES) for an upcard category and the unseen cards.
+
+    The house hole card is drawn from the unseen cards too. The house hits below 17 and while holding
+    an ace below 18, like GameController. Paths that empty the shoe are left out, so the probabilities
+    sum to less than one only for nearly empty shoes.
+
+    A hand state is given by the cards the house drew from counts, so states are memoized by those for
+    one query only. The memo holds a few thousand states at most and is dropped with the query.
+    """
+    left = list(counts)
+    # Mixed radix weights, the sum of the weights of the drawn cards is the key of a state.
+    weights = []
+    weight = 1
+    for count in counts:
+        weights.append(weight)
+        weight *= count + 1
+    memo = {}
+
+    def draws(hard: int, has_ace: bool, cards: int, drawn: int, total: int) -> list:
+        # Final hands are resolved in place, only hands the house hits again are recursed into.
+        result = [0.0] * len(OUTCOMES)
+        next_cards = min(cards + 1, 3)
+        for category in range(CATEGORIES):
+            count = left[category]
+            if not count:
+                continue
+            share = count / total
+            next_hard = hard + CATEGORY_HARD_POINTS[category]
+            next_ace = has_ace or category == ACE_CATEGORY
+            score = next_hard + 10 if next_ace and next_hard < 12 else next_hard
+            if score > 21:
+                result[BUST] += share
+            elif score >= 17 and not (next_ace and score < 18):
+                result[BLACKJACK if next_cards == 2 and score == 21 else score - 17] += share
+            else:
+                key = drawn + weights[category]
+                probabilities = memo.get(key)
+                if probabilities is None:
+                    left[category] = count - 1
+                    probabilities = memo[key] = draws(next_hard, next_ace, next_cards, key, total - 1)
+                    left[category] = count
+                for outcome, probability in enumerate(probabilities):
+                    result[outcome] += share * probability
+        return result
+
+    return tuple(draws(CATEGORY_HARD_POINTS[upcard], upcard == ACE_CATEGORY, 1, 0, sum(counts)))
+
+
+@lru_cache(maxsize=4096)
+def house_probabilities_without_depletion(counts: tuple, upcard: int) -> tuple:
+    """Get probabilities of house results, drawing every card with the shares of counts.
+
+    Much faster than house_probabilities, as the shoe is not depleted by the house's own cards.
+    """
+    total = sum(counts)
+    shares = [(category, count / total) for category, count in enumerate(counts) if count]
+    memo = {}
+
+    def draws(hard: int, has_ace: bool, cards: int) -> list:
+        # Final hands are resolved in place, like in house_probabilities.
+        result = [0.0] * len(OUTCOMES)
+        next_cards = min(cards + 1, 3)
+        for category, share in shares:
+            next_hard = hard + CATEGORY_HARD_POINTS[category]
+            next_ace = has_ace or category == ACE_CATEGORY
+            score = next_hard + 10 if next_ace and next_hard < 12 else next_hard
+            if score > 21:
+                result[BUST] += share
+            elif score >= 17 and not (next_ace and score < 18):
+                result[BLACKJACK if next_cards == 2 and score == 21 else score - 17] += share
+            else:
+                key = (next_hard, next_ace, next_cards)
+                probabilities = memo.get(key)
+                if probabilities is None:
+                    probabilities = memo[key] = draws(next_hard, next_ace, next_cards)
+                for outcome, probability in enumerate(probabilities):
+                    result[outcome] += share * probability
+        return result
+
+    return tuple(draws(CATEGORY_HARD_POINTS[upcard], upcard == ACE_CATEGORY, 1))
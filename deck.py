@@ -1,84 +1,187 @@
 """Deck."""
-from typing import Optional, List
-import requests
-from random import choice, shuffle
+from typing import Optional
+from random import Random
+
+
+SUITS = ("SPADES", "DIAMONDS", "CLUBS", "HEARTS")
+VALUES = ("ACE", "2", "3", "4", "5", "6", "7", "8", "9", "10", "JACK", "QUEEN", "KING")
+RANK_CODES = "A234567890JQK"
+POINTS = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+ACE = 0
+CARDS_IN_DECK = len(SUITS) * len(VALUES)
+
+# Lookups by card id, where id = suit index * 13 + rank.
+CARD_RANKS = bytes(card_id % len(VALUES) for card_id in range(CARDS_IN_DECK))
+CARD_POINTS = bytes(POINTS[rank] for rank in CARD_RANKS)
+CARD_CODES = tuple(RANK_CODES[card_id % len(VALUES)] + SUITS[card_id // len(VALUES)][0]
+                   for card_id in range(CARDS_IN_DECK))
 
 
 class Card:
-    """Dataclass for holding card information."""
+    """Card stored as a small integer id (0-51)."""
 
-    def __init__(self, value: str, suit: str, code: str, top_down=False):
+    __slots__ = ("id", "top_down")
+
+    def __init__(self, card_id: int, top_down=False):
         """Constructor."""
-        self.value = value
-        self.suit = suit
-        self.code = code
+        self.id = card_id
         self.top_down = top_down
 
+    @property
+    def rank(self) -> int:
+        """Get rank, 0 for ace up to 12 for king."""
+        return CARD_RANKS[self.id]
+
+    @property
+    def points(self) -> int:
+        """Get points of the card, ace counted as 11."""
+        return CARD_POINTS[self.id]
+
+    @property
+    def value(self) -> str:
+        """Get value name."""
+        return VALUES[CARD_RANKS[self.id]]
+
+    @property
+    def suit(self) -> str:
+        """Get suit name."""
+        return SUITS[self.id // len(VALUES)]
+
+    @property
+    def code(self) -> str:
+        """Get card code."""
+        return CARD_CODES[self.id]
+
     def __str__(self):
         """Str."""
-        return "??" if self.top_down else self.code
+        return "??" if self.top_down else CARD_CODES[self.id]
 
     def __repr__(self) -> str:
         """Repr."""
-        return self.code
+        return CARD_CODES[self.id]
 
     def __eq__(self, o) -> bool:
         """Eq."""
-        return isinstance(o, Card) and o.suit == self.suit and o.value == self.value
+        return isinstance(o, Card) and o.id == self.id
+
+    def __hash__(self) -> int:
+        """Hash."""
+        return self.id
+
+
+# Shared face up card of every id. They must not be modified, top down cards come from each deck's own pool.
+CARDS = tuple(Card(card_id) for card_id in range(CARDS_IN_DECK))
+
+_SHOE_TEMPLATES = {}
+
+# Hi-Lo count tag of every rank.
+HI_LO = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)
 
 
 class Deck:
     """Deck."""
 
-    DECK_BASE_API = "https://deckofcardsapi.com/api/deck/"
+    def __init__(self, deck_count: int = 1, shuffle: bool = False, rng: Random = None, penetration: float = 1.0,
+                 shuffle_source=None):
+        """Constructor.
 
-    def __init__(self, deck_count: int = 1, shuffle: bool = False):
-        """Constructor."""
+        Penetration is the share of the shoe dealt before the cut card comes out.
+        With a shuffle source (see shuffler.ShuffleSource) shuffled shoes are taken from it instead of rng.
+        """
+        if shuffle_source is not None and shuffle_source.deck_count != deck_count:
+            raise ValueError("Shuffle source has different amount of decks!")
         self.deck_count = deck_count
         self.is_shuffled = shuffle
+        self.rng = Random() if rng is None else rng
+        self.shuffle_source = shuffle_source
+        # Top down card of every id, turned face down again whenever it is drawn.
+        self._down_cards = [Card(card_id, True) for card_id in range(CARDS_IN_DECK)]
         self._backup_deck = self._generate_backup_pile()
-        self.card_pack = self._request(f"{Deck.DECK_BASE_API}new/?deck_count={self.deck_count}")
+        self._cursor = 0
+        self.cut_card = int(len(self._backup_deck) * penetration)
         if shuffle:
             self.shuffle()
 
+    @property
+    def remaining(self) -> int:
+        """Get count of cards left in the shoe."""
+        return len(self._backup_deck) - self._cursor
+
+    @property
+    def is_cut_card_reached(self) -> bool:
+        """Check if the shoe is dealt down to the cut card."""
+        return self._cursor >= self.cut_card
+
     def shuffle(self) -> None:
-        """Shuffle the deck."""
+        """Collect all cards back to the shoe and shuffle it."""
+        self._cursor = 0
         if self.is_shuffled:
-            try:
-                self.card_pack = requests.get(f"{Deck.DECK_BASE_API}{self.deck_id}/shuffle/")
-            except KeyError:
-                pass
-            shuffle(self._backup_deck)
+            if self.shuffle_source is not None:
+                self._backup_deck = self.shuffle_source.next_shoe()
+            else:
+                self.rng.shuffle(self._backup_deck)
 
     def draw_card(self, top_down: bool = False) -> Optional[Card]:
         """Draw card from the deck."""
-        if self.remaining:
-            card = choice(self._backup_deck) if self.is_shuffled else self._backup_deck[0]
-            self.remaining -= 1
-            self._backup_deck.remove(card)
-            return Card(card.value, card.suit, card.code, top_down)
-
-    def _request(self, url: str):
-        """Update deck."""
-        self.deck_id = "StoneAge"
-        self.remaining = len(self._backup_deck)
-        self.online = False
-        return self._backup_deck
-
-    def _generate_backup_pile(self) -> List[Card]:
-        """Generate backup pile."""
-        card_pile = []
-        suits = {"S": "SPADES", "D": 'DIAMONDS', 'H': 'HEARTS', 'C': 'CLUBS'}
-        values = {"J": "JACK", "Q": "QUEEN", "K": "KING", "A": "ACE", "2": "2", "3": "3", "4": "4", "5": "5", "6": "6",
-                  "7": "7", "8": "8", "9": "9", "0": "10"}
-        codes = ['AS', '2S', '3S', '4S', '5S', '6S', '7S', '8S', '9S', '0S', 'JS', 'QS', 'KS', 'AD', '2D', '3D', '4D',
-                 '5D', '6D', '7D', '8D', '9D', '0D', 'JD', 'QD', 'KD', 'AC', '2C', '3C', '4C', '5C', '6C', '7C', '8C',
-                 '9C', '0C', 'JC', 'QC', 'KC', 'AH', '2H', '3H', '4H', '5H', '6H', '7H', '8H', '9H', '0H', 'JH', 'QH',
-                 'KH']
-        for times in range(self.deck_count):
-            for code in codes:
-                suit = suits[code[-1]]
-                value = values[code[0]]
-                card = Card(value, suit, code)
-                card_pile.append(card)
-        return card_pile
\ No newline at end of file
+        if self._cursor < len(self._backup_deck):
+            card_id = self._backup_deck[self._cursor]
+            self._cursor += 1
+            return self._face_down(card_id) if top_down else CARDS[card_id]
+
+    def _face_down(self, card_id: int) -> Card:
+        """Get pooled top down card."""
+        card = self._down_cards[card_id]
+        card.top_down = True
+        return card
+
+    def _generate_backup_pile(self) -> bytearray:
+        """Generate backup pile of card ids."""
+        return generate_pile(self.deck_count)
+
+
+def shoe_template(deck_count: int) -> bytes:
+    """Get cached, immutable card ids of given amount of decks."""
+    template = _SHOE_TEMPLATES.get(deck_count)
+    if template is None:
+        template = _SHOE_TEMPLATES[deck_count] = bytes(range(CARDS_IN_DECK)) * deck_count
+    return template
+
+
+def generate_pile(deck_count: int) -> bytearray:
+    """Generate card ids of given amount of decks."""
+    return bytearray(shoe_template(deck_count))
+
+
+class ShoeTracker:
+    """Composition of the unseen cards of a shoe, with a Hi-Lo count.
+
+    One tracker is kept per table, updating it is O(1) per card.
+    """
+
+    def __init__(self, deck_count: int = 1):
+        """Constructor."""
+        self.deck_count = deck_count
+        self.reset()
+
+    def reset(self) -> None:
+        """Start over with a full shoe."""
+        self.remaining = [4 * self.deck_count] * len(VALUES)
+        self.cards_left = CARDS_IN_DECK * self.deck_count
+        self.running_count = 0
+
+    def on_card_drawn(self, card: Card) -> None:
+        """Remove a seen card from the shoe."""
+        rank = CARD_RANKS[card.id]
+        self.remaining[rank] -= 1
+        self.cards_left -= 1
+        self.running_count += HI_LO[rank]
+
+    @property
+    def decks_left(self) -> float:
+        """Get count of decks left in the shoe."""
+        return self.cards_left / CARDS_IN_DECK
+
+    @property
+    def true_count(self) -> float:
+        """Get running count per deck left."""
+        return self.running_count / self.decks_left if self.cards_left else 0.0
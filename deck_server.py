@@ -0,0 +1,97 @@
+"""Local stand-in for the deck of cards API."""
+import argparse
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import Random
+from urllib.parse import urlparse, parse_qs
+from GameOfBlackjack.deck import CARD_CODES, CARD_RANKS, VALUES, SUITS, generate_pile
+
+
+class DeckHandler(BaseHTTPRequestHandler):
+    """Answers the deck endpoints OnlineDeck uses: new, new/shuffle, draw, shuffle and return."""
+
+    # Keeps connections open for the pooled session of OnlineDeck, without waiting on small writes.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Handle request."""
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = parse_qs(url.query)
+        if parts[:2] != ["api", "deck"] or len(parts) < 3:
+            return self._send(404, {"success": False, "error": "Not found"})
+        decks = self.server.decks
+        with self.server.lock:
+            if parts[2] == "new":
+                deck_id = uuid.uuid4().hex[:12]
+                cards = generate_pile(int(query.get("deck_count", ["1"])[0]))
+                decks[deck_id] = {"pile": cards, "all": bytearray(cards)}
+                shuffled = parts[3:] == ["shuffle"]
+                if shuffled:
+                    self.server.rng.shuffle(cards)
+                return self._send(200, {"success": True, "deck_id": deck_id, "shuffled": shuffled,
+                                        "remaining": len(cards)})
+            deck = decks.get(parts[2])
+            if deck is None or len(parts) < 4:
+                return self._send(404, {"success": False, "error": "Deck ID does not exist."})
+            if parts[3] == "draw":
+                count = int(query.get("count", ["1"])[0])
+                drawn, deck["pile"] = deck["pile"][:count], deck["pile"][count:]
+                cards = [{"code": CARD_CODES[card_id], "value": VALUES[CARD_RANKS[card_id]],
+                          "suit": SUITS[card_id // len(VALUES)]} for card_id in drawn]
+                return self._send(200, {"success": len(drawn) == count, "deck_id": parts[2], "cards": cards,
+                                        "remaining": len(deck["pile"])})
+            if parts[3] in ("shuffle", "return"):
+                deck["pile"] = bytearray(deck["all"])
+                if parts[3] == "shuffle":
+                    self.server.rng.shuffle(deck["pile"])
+                return self._send(200, {"success": True, "deck_id": parts[2], "remaining": len(deck["pile"])})
+        self._send(404, {"success": False, "error": "Not found"})
+
+    def _send(self, status: int, data: dict) -> None:
+        """Send JSON response."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep quiet."""
+
+
+class DeckServer(ThreadingHTTPServer):
+    """Deck API server keeping its decks in memory."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, seed=None):
+        """Init, port 0 picks a free port."""
+        super().__init__((host, port), DeckHandler)
+        self.decks = {}
+        self.lock = threading.Lock()
+        self.rng = Random(seed)
+
+    @property
+    def base_url(self) -> str:
+        """Get API url for OnlineDeck."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/deck/"
+
+    def start(self) -> threading.Thread:
+        """Serve in a daemon thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve a local deck of cards API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    server = DeckServer(args.host, args.port)
+    print(f"Serving {server.base_url}")
+    server.serve_forever()
@@ -1,4 +1,5 @@
 """Game views."""
+import sys
 from abc import abstractmethod
 from enum import Enum
 
@@ -176,166 +177,186 @@ class SimpleView(GameView):
 class FancyView(GameView):
     """Fancy view."""
 
+    ASCII_SUITS = {'S': '♠', 'H': '♥', 'C': '♣', 'D': '♦'}
+    EMPTY_LINE = ' ' * 7
+    _card_lines = {}
+
+    def __init__(self, incremental: bool = False):
+        """Init.
+
+        With incremental, the table is drawn at the top of the terminal and later tables only rewrite changed rows.
+        """
+        self.incremental = incremental
+        self._last_frame = None
+
     class CardTemplate:
-        """Card templates."""
+        """Card templates, built the first time a card is rendered."""
         template_width = 7
-        templates = dict()
-        templates['AS'] = """_____
+        templates = None
+
+        @classmethod
+        def load(cls) -> dict:
+            """Get templates by card code, number cards by rank with ^ in place of the suit."""
+            if cls.templates is None:
+                templates = dict()
+                templates['AS'] = """_____
 |A .  |
 | /.\ |
 |(_._)|
 |  |  |
 |____V|"""
-        templates['AD'] = """____
+                templates['AD'] = """____
 |A ^  |
 | / \ |
 | \ / |
 |  .  |
 |____V|"""
-        templates['AC'] = """____
+                templates['AC'] = """____
 |A _  |
 | ( ) |
 |(_'_)|
 |  |  |
 |____V|"""
-        templates['AH'] = """_____
+                templates['AH'] = """_____
 |A_ _ |
 |( v )|
 | \ / |
 |  .  |
 |____V|"""
-        templates['2'] = """ _____ 
+                templates['2'] = """ _____ 
 |2    |
 |  ^  |
 |     |
 |  ^  |
 |____Z|"""
-        templates['3'] = """ _____ 
+                templates['3'] = """ _____ 
 |3    |
 | ^ ^ |
 |     |
 |  ^  |
 |____E|"""
-        templates['4'] = """ _____ 
+                templates['4'] = """ _____ 
 |4    |
 | ^ ^ |
 |     |
 | ^ ^ |
 |____h|"""
-        templates['5'] = """ _____ 
+                templates['5'] = """ _____ 
 |5    |
 | ^ ^ |
 |  ^  |
 | ^ ^ |
 |____S|"""
-        templates['6'] = """ _____ 
+                templates['6'] = """ _____ 
 |6    |
 | ^ ^ |
 | ^ ^ |
 | ^ ^ |
 |____9|"""
-        templates['7'] = """ _____ 
+                templates['7'] = """ _____ 
 |7    |
 | ^ ^ |
 |^ ^ ^|
 | ^ ^ |
 |____L|"""
-        templates['8'] = """ _____ 
+                templates['8'] = """ _____ 
 |8    |
 |^ ^ ^|
 | ^ ^ |
 |^ ^ ^|
 |____8|"""
-        templates['9'] = """ _____ 
+                templates['9'] = """ _____ 
 |9    |
 |^ ^ ^|
 |^ ^ ^|
 |^ ^ ^|
 |____6|"""
-        templates['0'] = """ _____ 
+                templates['0'] = """ _____ 
 |10 ^ |
 |^ ^ ^|
 |^ ^ ^|
 |^ ^ ^|
 |___0I|"""
-        templates['JS'] = """ _____ 
+                templates['JS'] = """ _____ 
 |J  ww|
 | ^ {)|
 |(.)% |
 | | % |
 |__%%[|"""
-        templates['QS'] = """ _____ 
+                templates['QS'] = """ _____ 
 |Q  ww|
 | ^ {(|
 |(.)%%|
 | |%%%|
 |_%%%O|"""
-        templates['KS'] = """ _____ 
+                templates['KS'] = """ _____ 
 |K  WW|
 | ^ {)|
 |(.)%%|
 | |%%%|
 |_%%%>|"""
-        templates['JC'] = """ _____ 
+                templates['JC'] = """ _____ 
 |J  ww|
 | o {)|
 |o o% |
 | | % |
 |__%%[|"""
-        templates['QC'] = """ _____ 
+                templates['QC'] = """ _____ 
 |Q  ww|
 | o {(|
 |o o%%|
 | |%%%|
 |_%%%O|"""
-        templates['KC'] = """ _____ 
+                templates['KC'] = """ _____ 
 |K  WW|
 | o {)|
 |o o%%|
 | |%%%|
 |_%%%>|"""
-        templates['JH'] = """ _____ 
+                templates['JH'] = """ _____ 
 |J  ww|
 |   {)|
 |(v)% |
 | v % |
 |__%%[|"""
-        templates['QH'] = """ _____ 
+                templates['QH'] = """ _____ 
 |Q  ww|
 |   {(|
 |(v)%%|
 | v%%%|
 |_%%%O|"""
-        templates['KH'] = """ _____ 
+                templates['KH'] = """ _____ 
 |K  WW|
 |   {)|
 |(v)%%|
 | v%%%|
 |_%%%>|"""
-        templates['JD'] = """ _____ 
+                templates['JD'] = """ _____ 
 |J  ww|
 | /\{)|
 | \/% |
 |   % |
 |__%%[|"""
-        templates['QD'] = """ _____ 
+                templates['QD'] = """ _____ 
 |Q  ww|
 | /\{(|
 | \/%%|
 |  %%%|
 |_%%%O|"""
-        templates['KD'] = """ _____ 
+                templates['KD'] = """ _____ 
 |K  WW|
 | /\{)|
 | \/%%|
 |  %%%|
 |_%%%>|"""
-        templates['??'] = """_____
+                templates['??'] = """_____
 |?    |
 |     |
 |     |
 |     |
 |____¿|"""
+                cls.templates = templates
+            return cls.templates
 
     def ask_move(self) -> Move:
         """Ask move."""
@@ -386,71 +407,78 @@ class FancyView(GameView):
         return input(f"{color}Enter name for player {player_nr}: {Color.Fg.orange}")
 
     def show_table(self, players: list, house, current_hand) -> None:
-        """Print table."""
-        ascii_suits = {'S': '♠', 'H': '♥', 'C': '♣', 'D': '♦'}
-        print(Color.Fg.orange + '-' * 20 * len(players))
-        print(f"{Color.Fg.light_green}House:{Color.reset}")
-        card_templates = []
-        for c in house.cards:
-            if str(c) in self.CardTemplate.templates.keys():
-                card_templates.append(self.CardTemplate.templates[str(c)].split('\n'))
-            else:
-                card_templates.append(
-                    self.CardTemplate.templates[str(c)[0]].replace('^', ascii_suits[str(c)[-1]]).split('\n'))
-
-        print(Color.Fg.light_red, end='')
-        for l in zip(*card_templates):
-            print('\t'.join(l))
-
-        print(Color.Fg.orange + '-' * 20 * len(players))
-        print(f"{Color.Fg.light_green}Players:{Color.reset}")
-
+        """Print table in one write."""
+        frame = self.render_table(players, house, current_hand)
+        if self.incremental:
+            frame = self._redraw(frame)
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+
+    def render_table(self, players: list, house, current_hand) -> str:
+        """Get table as text."""
+        frame = [Color.Fg.orange + '-' * 20 * len(players) + '\n',
+                 f"{Color.Fg.light_green}House:{Color.reset}\n",
+                 Color.Fg.light_red]
+        for line in zip(*[self.card_lines(str(c)) for c in house.cards]):
+            frame.append('\t'.join(line) + '\n')
+        frame.append(Color.Fg.orange + '-' * 20 * len(players) + '\n')
+        frame.append(f"{Color.Fg.light_green}Players:{Color.reset}\n")
+
+        # Hands are padded by 8 rows per missing card, so hands of different lengths have different heights.
+        hand_length = max((len(h.cards) for p in players for h in p.hands), default=0) * 8
+        hand_separator = f'\t{Color.Fg.light_green}x{Color.reset}\t'
         player_templates = []
-        hand_lengths = []
-        for p in players:
-            for h in p.hands:
-                hand_lengths.append(len(h.cards))
-        hand_length = max(hand_lengths) * 8
         for p in players:
             hand_templates = []
             for h in p.hands:
-                hand_color = Color.Fg.pink if h == current_hand else Color.Fg.light_red
-                cards = ''
-                for c in h.cards:
-                    cards += '\n' if cards != '' else ''
-                    if str(c) in self.CardTemplate.templates.keys():
-                        cards += self.CardTemplate.templates[str(c)]
-                    else:
-                        cards += self.CardTemplate.templates[str(c)[0]].replace('^', ascii_suits[str(c)[-1]])
-                for _ in range(hand_length - len(h.cards) * 8):
-                    cards += '\n' + ' ' * self.CardTemplate.template_width
-                hand_templates.append([hand_color + c for c in cards.split('\n')])
-
-            player = ''
-            for l in zip(*hand_templates):
-                player += f'\t{Color.Fg.light_green}x{Color.reset}\t'.join(l) + '\n'
+                hand_color = Color.Fg.pink if h is current_hand else Color.Fg.light_red
+                lines = [hand_color + line for c in h.cards for line in self.card_lines(str(c))]
+                if not h.cards:
+                    lines.append(hand_color)
+                lines += [hand_color + self.EMPTY_LINE] * (hand_length - len(h.cards) * 8)
+                hand_templates.append(lines)
+            player = '\n'.join(hand_separator.join(line) for line in zip(*hand_templates))
             player_templates.append(player.rstrip().split('\n'))
 
-        total_width = 0
-        for i, p in enumerate(players):
+        names, coins, total_width = [], [], 0
+        for p in players:
             width = len(p.hands) * self.CardTemplate.template_width + (len(p.hands) - 1) * 5
             total_width += width if total_width == 0 else width + 5
+            color = Color.Fg.purple if any(h is current_hand for h in p.hands) else Color.Fg.cyan
             name = p.name if len(p.name) < width else p.name[:width]
-            color = Color.Fg.purple if current_hand in p.hands else Color.Fg.cyan
-            print(f"{color}{name:^{width}}", end='')
-            print(f"\t{Color.Fg.orange}#\t" if i < len(players) - 1 else '', end='')
-
-        print('\n' + Color.Fg.orange + '-' * total_width + Color.reset)
-        for l in zip(*player_templates):
-            print(f"\t{Color.Fg.orange}#{Color.reset}\t".join(l))
-        print(Color.Fg.orange + '-' * total_width + Color.reset)
-
-        for i, p in enumerate(players):
-            width = len(p.hands) * self.CardTemplate.template_width + (len(p.hands) - 1) * 5
-            color = Color.Fg.purple if current_hand in p.hands else Color.Fg.cyan
-            print(f"{color}{str(p.coins) + '$': ^{width}}", end='')
-            print(f"\t{Color.Fg.orange}#\t" if i < len(players) - 1 else '', end='')
-        print(Color.reset)
+            names.append(f"{color}{name:^{width}}")
+            coins.append(f"{color}{str(p.coins) + '$': ^{width}}")
+        column_separator = f"\t{Color.Fg.orange}#\t"
+        frame.append(column_separator.join(names) + '\n')
+        frame.append(Color.Fg.orange + '-' * total_width + Color.reset + '\n')
+        row_separator = f"\t{Color.Fg.orange}#{Color.reset}\t"
+        for line in zip(*player_templates):
+            frame.append(row_separator.join(line) + '\n')
+        frame.append(Color.Fg.orange + '-' * total_width + Color.reset + '\n')
+        frame.append(column_separator.join(coins) + Color.reset + '\n')
+        return ''.join(frame)
+
+    @classmethod
+    def card_lines(cls, code: str) -> tuple:
+        """Get rendered lines of a card, number cards with their suit filled in."""
+        lines = cls._card_lines.get(code)
+        if lines is None:
+            templates = cls.CardTemplate.load()
+            if code in templates:
+                template = templates[code]
+            else:
+                template = templates[code[0]].replace('^', cls.ASCII_SUITS[code[-1]])
+            lines = cls._card_lines[code] = tuple(template.split('\n'))
+        return lines
+
+    def _redraw(self, frame: str) -> str:
+        """Get terminal output that turns the last drawn frame into this one, rewriting only changed rows."""
+        lines = frame.split('\n')
+        last, self._last_frame = self._last_frame, lines
+        if last is None or len(last) != len(lines):
+            return '\033[H\033[2J' + frame
+        changed = [f"\033[{row + 1};1H{line}\033[K" for row, line in enumerate(lines) if line != last[row]]
+        return ''.join(changed) + f"\033[{len(lines)};1H\033[J"
 
     def show_help(self):
         """Show help."""
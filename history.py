@@ -0,0 +1,127 @@
+"""Hand history log."""
+import mmap
+import os
+import struct
+from collections import namedtuple
+from GameOfBlackjack.game_view import Move
+
+# File header: magic, format version, record size.
+HEADER = struct.Struct("<4sHH")
+MAGIC = b"BJHL"
+VERSION = 2
+# Every record: kind, seat, hand index, code, value, amount in chips (see ledger).
+RECORD = struct.Struct("<BHBBIq")
+Record = namedtuple("Record", "kind seat hand code value amount")
+
+# Kinds of records and what code, value and amount hold in them.
+ROUND = 0  # seat: seats at the table, value: round number, amount: buy in
+CARD = 1  # code: card id of a card in the final hand
+MOVE = 2  # code: index in MOVES, value: hand score before the move
+PAYOUT = 3  # code: index in blackjack.Outcome, value: final hand score, amount: chips paid out
+
+# Seat of house cards, players are seated by their index in GameController.players.
+HOUSE = 0xFFFF
+MAX_SEATS = HOUSE
+MOVES = tuple(Move)
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+
+
+class HistoryWriter:
+    """Appends fixed width round records to a file, writing in batches.
+
+    A new file starts with the header, an existing one must have the header of this format.
+    """
+
+    def __init__(self, path: str, buffer_records: int = 4096):
+        """Init."""
+        with open(path, "ab") as file:
+            if not file.tell():
+                file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        with open(path, "rb") as file:
+            read_header(file)
+        self.file = open(path, "ab")
+        self.buffer = bytearray()
+        self.buffer_size = buffer_records * RECORD.size
+
+    def write(self, kind: int, seat: int = 0, hand: int = 0, code: int = 0, value: int = 0, amount: int = 0) -> None:
+        """Add record."""
+        if kind == ROUND and seat > MAX_SEATS:
+            raise ValueError(f"History holds up to {MAX_SEATS} seats!")
+        self.buffer += RECORD.pack(kind, seat, hand, code, value, amount)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.buffer.clear()
+
+    def close(self) -> None:
+        """Write buffered records and close the file."""
+        self.flush()
+        self.file.close()
+
+
+class HistoryReader:
+    """Reads a history file through a memory map, records are unpacked only while iterating."""
+
+    def __init__(self, path: str):
+        """Init."""
+        self.file = open(path, "rb")
+        try:
+            read_header(self.file)
+        except ValueError:
+            self.file.close()
+            raise
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = (size - HEADER.size) // RECORD.size
+
+    def __len__(self) -> int:
+        """Get count of records."""
+        return self.count
+
+    def __getitem__(self, index: int) -> tuple:
+        """Get raw record."""
+        if not 0 <= index < self.count:
+            raise IndexError("Record index out of range!")
+        return RECORD.unpack_from(self.map, HEADER.size + index * RECORD.size)
+
+    def __iter__(self):
+        """Iterate raw record tuples."""
+        return RECORD.iter_unpack(memoryview(self.map)[HEADER.size:HEADER.size + self.count * RECORD.size])
+
+    def rounds(self):
+        """Iterate lists of raw records, one list per round."""
+        current = []
+        for record in self:
+            if record[0] == ROUND and current:
+                yield current
+                current = []
+            current.append(record)
+        if current:
+            yield current
+
+    def close(self) -> None:
+        """Close the file."""
+        self.map.close()
+        self.file.close()
+
+
+def read_header(file) -> int:
+    """Check header at the start of a history file, get the format version."""
+    data = file.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("History file has no header!")
+    magic, version, record_size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Not a history file!")
+    if version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"History file has format version {version}, expected {VERSION}!")
+    return version
+
+
+def decode(record: tuple) -> Record:
+    """Get record with named fields."""
+    return Record(*record)
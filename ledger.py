@@ -0,0 +1,71 @@
+"""Fixed point chip ledger."""
+
+# Coins are kept as integer units, so 3:2 and surrender payouts stay exact.
+UNITS_PER_COIN = 100
+
+
+def to_units(coins) -> int:
+    """Get units of coins."""
+    return round(coins * UNITS_PER_COIN)
+
+
+def to_coins(units: int):
+    """Get coins of units, whole coins as int."""
+    return units // UNITS_PER_COIN if units % UNITS_PER_COIN == 0 else units / UNITS_PER_COIN
+
+
+class Ledger:
+    """Stake, outcome and payout of every hand of the last round, in units, and totals over all rounds.
+
+    Outcomes are members of the given enum (blackjack.Outcome).
+    """
+
+    def __init__(self, outcomes):
+        """Init."""
+        self.outcomes = outcomes
+        # (player, hand, stake, outcome, payout) of the hands of the last round.
+        self.entries = []
+        self.rounds = 0
+        self.staked = 0
+        self.paid = 0
+
+    def settle(self, players: list, house) -> list:
+        """Resolve all hands of players against the final house hand in one pass, pay them and get the entries."""
+        entries = []
+        outcomes = self.outcomes
+        blackjack, surrender, bust = outcomes.BLACKJACK, outcomes.SURRENDER, outcomes.BUST
+        win, push, lose = outcomes.WIN, outcomes.PUSH, outcomes.LOSE
+        house_score = house.score if house.score <= 21 else 0
+        house_blackjack = house.is_blackjack
+        staked = paid = 0
+        for player in players:
+            won = 0
+            for hand in player.hands:
+                stake = hand.stake
+                if hand.is_blackjack and not house_blackjack:
+                    outcome, payout = blackjack, stake * 5 // 2
+                elif hand.is_surrendered:
+                    outcome, payout = surrender, stake // 2
+                elif hand.score > 21:
+                    outcome, payout = bust, 0
+                elif hand.score > house_score:
+                    outcome, payout = win, stake * 2
+                elif hand.score == house_score:
+                    outcome, payout = push, stake
+                else:
+                    outcome, payout = lose, 0
+                entries.append((player, hand, stake, outcome, payout))
+                staked += stake
+                won += payout
+            player.chips += won
+            paid += won
+        self.entries = entries
+        self.rounds += 1
+        self.staked += staked
+        self.paid += paid
+        return entries
+
+    @property
+    def house_edge(self) -> float:
+        """Get share of all stakes kept by the house."""
+        return (self.staked - self.paid) / self.staked if self.staked else 0.0
@@ -0,0 +1,68 @@
+"""Load test of the game server."""
+import argparse
+import asyncio
+import statistics
+import time
+
+
+async def play_seat(host: str, port: int, name: str, until: float, latencies: list) -> int:
+    """Play a seat until given time, hitting below 17.
+
+    Latency of a decision is the time from sending a move to the next line from the server.
+    Get count of settled hands.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"JOIN {name}\n".encode())
+    hands = 0
+    sent = None
+    try:
+        while time.perf_counter() < until:
+            try:
+                line = await asyncio.wait_for(reader.readline(), until - time.perf_counter())
+            except asyncio.TimeoutError:
+                break
+            if not line or line.startswith(b"BROKE"):
+                break
+            if sent is not None:
+                latencies.append(time.perf_counter() - sent)
+                sent = None
+            if line.startswith(b"TURN"):
+                writer.write(b"h\n" if int(line.split()[1]) < 17 else b"s\n")
+                sent = time.perf_counter()
+            elif line.startswith(b"RESULT"):
+                hands += 1
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    except ConnectionError:
+        pass
+    writer.close()
+    return hands
+
+
+async def run_load_test(host: str = "127.0.0.1", port: int = 8765, seats: int = 200,
+                        duration: float = 10.0) -> dict:
+    """Connect seats to a running server for duration seconds and get latency statistics."""
+    latencies = []
+    until = time.perf_counter() + duration
+    hands = await asyncio.gather(*(play_seat(host, port, f"load{seat}", until, latencies) for seat in range(seats)))
+    latencies.sort()
+    stats = {"seats": seats, "hands": sum(hands), "decisions": len(latencies),
+             "decisions_per_second": len(latencies) / duration}
+    if latencies:
+        stats.update({"mean_ms": statistics.mean(latencies) * 1000,
+                      "p50_ms": latencies[len(latencies) // 2] * 1000,
+                      "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+                      "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+                      "max_ms": latencies[-1] * 1000})
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure decision latency of a local game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seats", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    for key, value in asyncio.run(run_load_test(args.host, args.port, args.seats, args.duration)).items():
+        print(f"{key: <22}{value:.2f}" if isinstance(value, float) else f"{key: <22}{value}")
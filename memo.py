@@ -0,0 +1,56 @@
+"""Memoized strategy decisions."""
+from collections import OrderedDict
+from GameOfBlackjack.game_view import Move
+
+
+class DecisionCache:
+    """Bounded LRU cache of the moves of cacheable strategies, with hit and miss counters.
+
+    A move is cached by strategy class, ranks of the hand's cards, rank of the house upcard, decks count
+    and the strategy's cache_state(). One cache can be shared by many strategies and tables.
+    """
+
+    def __init__(self, size: int = 65536):
+        """Init."""
+        self.size = size
+        self.moves = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def attach(self, strategy) -> None:
+        """Answer play_move of a strategy instance from the cache."""
+        if not strategy.CACHEABLE:
+            raise ValueError(f"{type(strategy).__name__} is not cacheable!")
+        play_move = strategy.play_move
+
+        def cached_play_move(hand) -> Move:
+            return self.play_move(strategy, play_move, hand)
+        strategy.play_move = cached_play_move
+
+    def play_move(self, strategy, play_move, hand) -> Move:
+        """Get cached move of a strategy, calling play_move on a miss."""
+        house = strategy.house.cards
+        upcard = house[1] if house[0].top_down else house[0]
+        key = (type(strategy), tuple(sorted(card.rank for card in hand.cards)), upcard.rank, strategy.decks_count,
+               strategy.cache_state())
+        move = self.moves.get(key)
+        if move is not None:
+            self.hits += 1
+            self.moves.move_to_end(key)
+            return move
+        self.misses += 1
+        move = self.moves[key] = play_move(hand)
+        if len(self.moves) > self.size:
+            self.moves.popitem(last=False)
+        return move
+
+    @property
+    def hit_rate(self) -> float:
+        """Get share of moves answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        """Forget cached moves and counts."""
+        self.moves.clear()
+        self.hits = self.misses = 0
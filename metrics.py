@@ -0,0 +1,131 @@
+"""In-process counters and histograms."""
+import json
+from bisect import bisect_left
+from time import perf_counter
+
+# Metrics of GameController.
+ROUNDS = "blackjack_rounds_total"
+CARDS_DRAWN = "blackjack_cards_drawn_total"
+CARD_DRAWN_CALLS = "blackjack_on_card_drawn_calls_total"
+PHASE_SECONDS = "blackjack_phase_seconds"
+PLAY_MOVE_SECONDS = "blackjack_play_move_seconds"
+CARD_DRAWN_SECONDS = "blackjack_on_card_drawn_fanout_seconds"
+
+
+class Histogram:
+    """Observed values counted in buckets by upper bound, in seconds by default."""
+
+    BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0)
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        """Init."""
+        self.buckets = buckets
+        # Last count is of values above every bucket.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lap(self, start: float) -> float:
+        """Observe time since start and get the current time."""
+        now = perf_counter()
+        self.observe(now - start)
+        return now
+
+    @property
+    def mean(self) -> float:
+        """Get mean of the observed values."""
+        return self.sum / self.count if self.count else 0.0
+
+    def cumulative(self) -> list:
+        """Get (upper bound, count of values up to it) of every bucket and infinity."""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Metrics:
+    """Counters and histograms by name and labels.
+
+    Labels are a tuple of (label, value) pairs, the same tuple should be used for the same series.
+    """
+
+    def __init__(self):
+        """Init."""
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name: str, amount: float = 1, labels: tuple = ()) -> None:
+        """Increase counter."""
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def histogram(self, name: str, labels: tuple = ()) -> Histogram:
+        """Get histogram, created on first use."""
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        return histogram
+
+    def observe(self, name: str, value: float, labels: tuple = ()) -> None:
+        """Add value to histogram."""
+        self.histogram(name, labels).observe(value)
+
+    def lap(self, name: str, labels: tuple, start: float) -> float:
+        """Observe time since start in histogram and get the current time."""
+        return self.histogram(name, labels).lap(start)
+
+    def reset(self) -> None:
+        """Forget all values."""
+        self.counters.clear()
+        self.histograms.clear()
+
+    def to_dict(self) -> dict:
+        """Get all metrics as plain data."""
+        return {
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in sorted(self.counters.items())],
+            "histograms": [{"name": name, "labels": dict(labels), "count": histogram.count, "sum": histogram.sum,
+                            "mean": histogram.mean,
+                            "buckets": [[repr(bound), count] for bound, count in histogram.cumulative()]}
+                           for (name, labels), histogram in sorted(self.histograms.items(), key=lambda i: i[0])]}
+
+    def to_json(self) -> str:
+        """Get all metrics as JSON."""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Get all metrics in Prometheus text format."""
+        lines, typed = [], set()
+        for (name, labels), value in sorted(self.counters.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), histogram in sorted(self.histograms.items(), key=lambda i: i[0]):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            for bound, count in histogram.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    """Get labels in Prometheus format."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
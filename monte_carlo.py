@@ -0,0 +1,184 @@
+"""Vectorized Monte Carlo engine for table driven strategies."""
+import numpy as np
+from GameOfBlackjack.deck import VALUES, POINTS, ACE
+from GameOfBlackjack.strategy import TABLE_CODES, UPCARDS, SOFT_ROWS, SPLIT_ROWS
+
+HIT, STAND, DOUBLE_DOWN, SURRENDER, SPLIT = range(len(TABLE_CODES))
+TOTALS = SOFT_ROWS
+RANKS = len(VALUES)
+RANK_POINTS = np.array(POINTS, np.int16)
+HARD_POINTS = np.where(np.arange(RANKS) == ACE, 1, RANK_POINTS).astype(np.int16)
+
+
+class TableStrategy:
+    """Decision table of strategy.compile_table as arrays.
+
+    hard and soft are indexed by hand score and upcard index (2-10 -> 0-8, ace -> 9),
+    split by rank of the pair and upcard index.
+    """
+
+    def __init__(self, table: bytes):
+        """Init."""
+        rows = np.frombuffer(table, np.int8).reshape(-1, UPCARDS)
+        self.hard = rows[:SOFT_ROWS]
+        self.soft = rows[SOFT_ROWS:SPLIT_ROWS]
+        self.split = rows[SPLIT_ROWS:]
+
+    @staticmethod
+    def from_strategy(strategy) -> "TableStrategy":
+        """Get table of a Karmoai like strategy."""
+        return TableStrategy(strategy.table)
+
+
+class MonteCarloResult:
+    """Summed results per (initial player score, upcard index) cell."""
+
+    def __init__(self):
+        """Init."""
+        self.totals = np.zeros((TOTALS, UPCARDS))
+        self.counts = np.zeros((TOTALS, UPCARDS), np.int64)
+
+    @property
+    def hands(self) -> int:
+        """Get count of played hands."""
+        return int(self.counts.sum())
+
+    @property
+    def ev(self) -> np.ndarray:
+        """Get expected value per hand in bets, nan for cells never dealt."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.totals / self.counts
+
+    @property
+    def total_ev(self) -> float:
+        """Get expected value of a hand over all cells."""
+        return float(self.totals.sum() / self.counts.sum())
+
+
+class MonteCarlo:
+    """Plays many independent hands at once, each from a fresh shoe.
+
+    The rules follow GameController: the house hits below 17 and while holding an ace below 18,
+    double down and surrender are allowed at any point, a player blackjack pays 3:2 unless the
+    house has one too. Split hands are not split again.
+    """
+
+    def __init__(self, table: TableStrategy, decks_count: int, seed=None):
+        """Init."""
+        self.table = table
+        self.decks_count = decks_count
+        self.rng = np.random.default_rng(seed)
+
+    def run(self, hands: int, batch: int = 500_000) -> MonteCarloResult:
+        """Play given amount of hands."""
+        result = MonteCarloResult()
+        while hands > 0:
+            self._run_batch(min(batch, hands), result)
+            hands -= batch
+        return result
+
+    def _draw(self, counts: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Draw one card without replacement from the shoe of every given row."""
+        remaining = counts[rows].cumsum(axis=1)
+        pick = (self.rng.random(len(rows)) * remaining[:, -1]).astype(np.int16)
+        ranks = (remaining <= pick[:, None]).sum(axis=1)
+        counts[rows, ranks] -= 1
+        return ranks
+
+    def _first_moves(self, first: np.ndarray, second: np.ndarray, upcard: np.ndarray) -> np.ndarray:
+        """Get moves the split table gives for pairs, -1 where the hand tables decide."""
+        return np.where(first == second, self.table.split[first, upcard], -1).astype(np.int8)
+
+    def _play(self, counts, rows, first, second, upcard, first_moves):
+        """Play hands to the end, return final scores, bet multipliers, surrender flags and drawn cards."""
+        hard = HARD_POINTS[first] + HARD_POINTS[second]
+        aces = (first == ACE).astype(np.int16) + (second == ACE)
+        bets = np.ones(len(rows))
+        surrendered = np.zeros(len(rows), bool)
+        drawn = np.zeros(len(rows), np.int16)
+        score = _score(hard, aces)
+        active = score < 21
+        while active.any():
+            soft = (aces > 0) & (score >= 12) & (score < 20)
+            moves = np.where(soft, self.table.soft[score, upcard], self.table.hard[np.minimum(score, 21), upcard])
+            if first_moves is not None:
+                moves = np.where(first_moves < 0, moves, first_moves)
+                first_moves = None
+            draw = active & ((moves == HIT) | (moves == DOUBLE_DOWN))
+            ranks = self._draw(counts, rows[draw])
+            hard[draw] += HARD_POINTS[ranks]
+            aces[draw] += ranks == ACE
+            drawn[draw] += 1
+            bets[active & (moves == DOUBLE_DOWN)] = 2
+            surrendered |= active & (moves == SURRENDER)
+            score = _score(hard, aces)
+            active &= (moves == HIT) & (score < 21)
+        return score, bets, surrendered, drawn
+
+    def _play_house(self, counts, rows, up, hole):
+        """Play house hands, return final scores and blackjack flags."""
+        hard = HARD_POINTS[up] + HARD_POINTS[hole]
+        aces = (up == ACE).astype(np.int16) + (hole == ACE)
+        score = _score(hard, aces)
+        blackjack = score == 21
+        drawing = (score < 17) | ((aces > 0) & (score < 18))
+        while drawing.any():
+            ranks = self._draw(counts, rows[drawing])
+            hard[drawing] += HARD_POINTS[ranks]
+            aces[drawing] += ranks == ACE
+            score = _score(hard, aces)
+            drawing &= (score < 17) | ((aces > 0) & (score < 18))
+        return score, blackjack
+
+    @staticmethod
+    def _settle(score, bets, surrendered, drawn, house_score, house_blackjack) -> np.ndarray:
+        """Get won or lost bets of finished hands."""
+        blackjack = (drawn == 0) & (score == 21)
+        return np.select(
+            [blackjack & ~house_blackjack, surrendered, score > 21,
+             (house_score > 21) | (score > house_score), score == house_score],
+            [1.5, -0.5, -bets, bets, 0.0], -bets)
+
+    def _run_batch(self, n: int, result: MonteCarloResult) -> None:
+        """Play a batch of hands and add them to result."""
+        rows = np.arange(n)
+        counts = np.full((n, RANKS), 4 * self.decks_count, np.int16)
+        first, second = self._draw(counts, rows), self._draw(counts, rows)
+        up, hole = self._draw(counts, rows), self._draw(counts, rows)
+        upcard = RANK_POINTS[up] - 2
+        start_score = _score(HARD_POINTS[first] + HARD_POINTS[second],
+                             (first == ACE).astype(np.int16) + (second == ACE))
+
+        first_moves = self._first_moves(first, second, upcard)
+        split = first_moves == SPLIT
+        split_rows = rows[split]
+        # A split hand keeps the first card and gets a new second card, the other hand is played after it.
+        second[split] = self._draw(counts, split_rows)
+        first_moves[split] = self._first_moves(first[split], second[split], upcard[split])
+        first_moves[first_moves == SPLIT] = -1
+        played = self._play(counts, rows, first, second, upcard, first_moves)
+
+        other = self._draw(counts, split_rows)
+        other_moves = self._first_moves(first[split], other, upcard[split])
+        other_moves[other_moves == SPLIT] = -1
+        other_played = self._play(counts, split_rows, first[split], other, upcard[split], other_moves)
+
+        house_score, house_blackjack = self._play_house(counts, rows, up, hole)
+        won = self._settle(*played, house_score, house_blackjack)
+        won[split] += self._settle(*other_played, house_score[split], house_blackjack[split])
+        np.add.at(result.totals, (start_score, upcard), won)
+        np.add.at(result.counts, (start_score, upcard), 1)
+
+
+def _score(hard: np.ndarray, aces: np.ndarray) -> np.ndarray:
+    """Get scores from hard scores and ace counts."""
+    return hard + 10 * ((aces > 0) & (hard < 12))
+
+
+def evaluate_strategy(strategy_class, hands: int, deck_counts=range(1, 9), seed=None) -> dict:
+    """Get Monte Carlo results of a table strategy for every deck count."""
+    results = {}
+    for decks_count in deck_counts:
+        table = TableStrategy.from_strategy(strategy_class([], None, decks_count))
+        results[decks_count] = MonteCarlo(table, decks_count, seed).run(hands)
+    return results
@@ -0,0 +1,153 @@
+"""Deck dealt by a deck of cards API."""
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from GameOfBlackjack.deck import Deck, CARDS, CARD_CODES, shoe_template
+
+CARD_IDS = {code: card_id for card_id, code in enumerate(CARD_CODES)}
+
+
+class OnlineDeck(Deck):
+    """Deck whose cards come from a deckofcardsapi.com compatible API.
+
+    Cards are drawn in bulk (draw/?count=batch) over one pooled session into a buffer, which is refilled
+    in the background once it runs below low_water cards. If the API fails, the deck falls back to a local
+    pile of the cards not dealt yet and stays offline.
+    """
+
+    DECK_BASE_API = "https://deckofcardsapi.com/api/deck/"
+
+    def __init__(self, deck_count: int = 1, shuffle: bool = False, rng: Random = None, penetration: float = 1.0,
+                 base_url: str = DECK_BASE_API, batch: int = 52, low_water: int = 16, timeout: float = 5.0,
+                 session=None):
+        """Constructor."""
+        import requests
+        self.base_url = base_url
+        self.batch = batch
+        self.low_water = low_water
+        self.timeout = timeout
+        self.session = requests.Session() if session is None else session
+        self.buffer = deque()
+        self.dealt = bytearray()
+        self.api_remaining = 0
+        self.lock = threading.Lock()
+        self.refill = None
+        self.executor = ThreadPoolExecutor(1)
+        super().__init__(deck_count, False, rng, penetration)
+        self.is_shuffled = shuffle
+        self._connect()
+        if shuffle:
+            self.shuffle()
+
+    def _get(self, path: str) -> dict:
+        """Call the API."""
+        response = self.session.get(self.base_url + path, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        if not data.get("success"):
+            raise ValueError(data.get("error", "Deck API call failed!"))
+        return data
+
+    def _connect(self) -> None:
+        """Create the deck in the API, or fall back to the local pile."""
+        self.online = False
+        self.deck_id = "StoneAge"
+        try:
+            data = self._get(f"new/{'shuffle/' if self.is_shuffled else ''}?deck_count={self.deck_count}")
+        except Exception:
+            return
+        self.deck_id = data["deck_id"]
+        self.api_remaining = data["remaining"]
+        self.online = True
+
+    @property
+    def remaining(self) -> int:
+        """Get count of cards left in the shoe."""
+        if self.online:
+            return len(self._backup_deck) - len(self.dealt)
+        return super().remaining
+
+    def shuffle(self) -> None:
+        """Return all cards to the shoe and shuffle it."""
+        self._cursor = 0
+        if not self.online:
+            self.dealt.clear()
+            super().shuffle()
+            return
+        self._wait_refill()
+        self.buffer.clear()
+        self.dealt.clear()
+        try:
+            action = 'shuffle' if self.is_shuffled else 'return'
+            self.api_remaining = self._get(f"{self.deck_id}/{action}/")["remaining"]
+        except Exception:
+            with self.lock:
+                self._fall_back()
+            return
+        self._start_refill()
+
+    def draw_card(self, top_down: bool = False):
+        """Draw card from the buffer, waiting for the API only if it is empty."""
+        if not self.online:
+            return super().draw_card(top_down)
+        if not self.buffer:
+            self._wait_refill()
+            if not self.buffer:
+                self._fill()
+        with self.lock:
+            if not self.online:
+                return super().draw_card(top_down)
+            if not self.buffer:
+                return None
+            card_id = self.buffer.popleft()
+            self.dealt.append(card_id)
+            self._cursor += 1
+        if len(self.buffer) < self.low_water:
+            self._start_refill()
+        return self._face_down(card_id) if top_down else CARDS[card_id]
+
+    def _fill(self) -> None:
+        """Draw a batch of cards from the API into the buffer."""
+        count = min(self.batch, self.api_remaining)
+        if not self.online or count <= 0:
+            return
+        try:
+            data = self._get(f"{self.deck_id}/draw/?count={count}")
+            card_ids = [CARD_IDS[card["code"]] for card in data["cards"]]
+        except Exception:
+            with self.lock:
+                self._fall_back()
+            return
+        with self.lock:
+            self.api_remaining = data["remaining"]
+            self.buffer.extend(card_ids)
+
+    def _start_refill(self) -> None:
+        """Refill the buffer in the background unless a refill is running."""
+        if self.online and self.api_remaining and (self.refill is None or self.refill.done()):
+            self.refill = self.executor.submit(self._fill)
+
+    def _wait_refill(self) -> None:
+        """Wait for a running refill."""
+        if self.refill is not None:
+            self.refill.result()
+            self.refill = None
+
+    def _fall_back(self) -> None:
+        """Continue with a local pile of the cards not dealt yet, buffered cards first. Call with the lock held."""
+        self.online = False
+        self.deck_id = "StoneAge"
+        rest = bytearray(shoe_template(self.deck_count))
+        for card_id in bytes(self.dealt) + bytes(self.buffer):
+            rest.remove(card_id)
+        self.rng.shuffle(rest)
+        self._backup_deck = bytearray(self.dealt) + bytearray(self.buffer) + rest
+        self._cursor = len(self.dealt)
+        self.buffer.clear()
+
+    def close(self) -> None:
+        """Stop refilling and close the session."""
+        self._wait_refill()
+        self.executor.shutdown()
+        self.session.close()
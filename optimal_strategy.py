@@ -0,0 +1,196 @@
+"""Composition dependent strategy."""
+import atexit
+import multiprocessing
+import os
+import shelve
+from collections import OrderedDict
+from GameOfBlackjack.dealer import house_probabilities, house_probabilities_without_depletion, composition, \
+    card_category, CATEGORIES, CATEGORY_HARD_POINTS, ACE_CATEGORY, BLACKJACK, BUST
+from GameOfBlackjack.deck import CARDS_IN_DECK
+from GameOfBlackjack.game_view import Move
+from GameOfBlackjack.strategy import Strategy, TABLE_MOVES, TABLE_CODES
+
+HIT, STAND, DOUBLE_DOWN, SURRENDER, SPLIT = range(len(TABLE_CODES))
+# Solved table: best move per hand state (hard score * 2 + has ace), then per pair category.
+HARD_SCORES = 32
+PAIRS_OFFSET = 2 * HARD_SCORES
+
+
+class Solver:
+    """Expected value solver with an in-memory LRU cache and an optional on-disk cache.
+
+    Compositions are rounded to RESOLUTION cards before solving, so nearby shoes share one solution.
+    The player's draws after the decision are taken from the same composition, and so are the house's
+    unless exact is set. Split hands are not split again.
+    """
+
+    RESOLUTION = CARDS_IN_DECK
+
+    def __init__(self, path: str = None, cache_size: int = 65536, exact: bool = False):
+        """Init.
+
+        With a path, solved tables are also kept in a shelve file there and reused by later runs.
+        A shelve file takes one writer, so it is used only by the process opening it and not by forked ones.
+        """
+        self.pid = os.getpid()
+        self.exact = exact
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.shelf = shelve.open(path) if path is not None else None
+
+    def close(self) -> None:
+        """Write the on-disk cache."""
+        if self.shelf is not None and self.pid == os.getpid():
+            self.shelf.close()
+            self.shelf = None
+
+    def __enter__(self) -> "Solver":
+        """Enter."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close on exit."""
+        self.close()
+
+    def rounded(self, counts: tuple) -> tuple:
+        """Round card counts to RESOLUTION cards."""
+        total = sum(counts)
+        return tuple(round(count * self.RESOLUTION / total) for count in counts) if total else counts
+
+    def solve(self, counts: tuple, upcard: int) -> bytes:
+        """Get best move table for card counts by category (not rounded yet) and upcard category."""
+        key = (self.rounded(counts), upcard)
+        table = self.cache.get(key)
+        if table is not None:
+            self.cache.move_to_end(key)
+            return table
+        shelf = self.shelf if self.pid == os.getpid() else None
+        shelf_key = f"{int(self.exact)}:{upcard}:{','.join(map(str, key[0]))}"
+        if shelf is not None and shelf_key in shelf:
+            table = shelf[shelf_key]
+        else:
+            house = (house_probabilities if self.exact else house_probabilities_without_depletion)(*key)
+            table = self._solve(*key, house)
+            if shelf is not None:
+                shelf[shelf_key] = table
+        self.cache[key] = table
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return table
+
+    @staticmethod
+    def _solve(counts: tuple, upcard: int, house: tuple) -> bytes:
+        """Solve best moves of every hand state against given house result probabilities.
+
+        States are indexed like the table, hard score * 2 + has ace. From a hard score of 12 on an ace counts
+        one, so the soft state is solved once with the hard one. Double down is expanded only while hitting
+        wins: doubling gets twice the EV of standing after one card, which is at most the EV of hitting,
+        so it cannot beat a hit worth zero or less.
+        """
+        total = sum(counts)
+        draws = [(CATEGORY_HARD_POINTS[category], category == ACE_CATEGORY, count / total)
+                 for category, count in enumerate(counts) if count]
+        table = bytearray([STAND]) * (PAIRS_OFFSET + CATEGORIES)
+        scores = [hard + 10 if has_ace and hard < 12 else hard for hard in range(HARD_SCORES) for has_ace in (0, 1)]
+        stands = []
+        for score in range(HARD_SCORES):
+            if score > 21:
+                stands.append(-1.0)
+                continue
+            won = house[BUST] + sum(house[:max(0, min(score - 17, 5))])
+            lost = sum(house[max(0, score - 16):5]) + (house[BLACKJACK] if score < 21 else 0.0)
+            stands.append(won - lost)
+        evs = [0.0] * PAIRS_OFFSET
+
+        # Higher hard scores first, a hit only leads to higher ones.
+        for hard in range(HARD_SCORES - 1, 1, -1):
+            for has_ace in ((False,) if hard >= 12 else (False, True)):
+                state = hard * 2 + has_ace
+                score = scores[state]
+                best = stands[score]
+                if score < 21:
+                    move = STAND
+                    if best < -0.5:
+                        move, best = SURRENDER, -0.5
+                    hit = 0
+                    for points, is_ace, p in draws:
+                        hit += p * evs[(hard + points) * 2 + (has_ace or is_ace)]
+                    if hit > best:
+                        move, best = HIT, hit
+                    if hit > 0:
+                        double = 0
+                        for points, is_ace, p in draws:
+                            double += p * stands[scores[(hard + points) * 2 + (has_ace or is_ace)]]
+                        if 2 * double > best:
+                            move, best = DOUBLE_DOWN, 2 * double
+                    table[state] = move
+                evs[state] = best
+            if hard >= 12:
+                evs[hard * 2 + 1] = evs[hard * 2]
+                table[hard * 2 + 1] = table[hard * 2]
+
+        for category in range(CATEGORIES):
+            is_ace = category == ACE_CATEGORY
+            points = CATEGORY_HARD_POINTS[category]
+            pair = 2 * points * 2 + is_ace
+            split_ev = 0
+            for draw_points, draw_ace, p in draws:
+                state = (points + draw_points) * 2 + (is_ace or draw_ace)
+                # A split hand with 21 on two cards is paid as blackjack.
+                split_ev += p * (1.5 * (1 - house[BLACKJACK]) if scores[state] == 21 else evs[state])
+            table[PAIRS_OFFSET + category] = SPLIT if 2 * split_ev > evs[pair] else table[pair]
+        return bytes(table)
+
+
+class OptimalAI(Strategy):
+    """Plays the move with the best expected value against the unseen cards of the shoe."""
+
+    EVENTS = frozenset()
+    CACHEABLE = True
+    # Shelve file of solved tables shared by runs, None keeps them only in memory.
+    # Only the main process uses it and closes it at exit, worker processes of a simulation solve in memory.
+    CACHE_PATH = None
+    _solver = None
+
+    def __init__(self, other_players: list, house, decks_count: int):
+        """Init."""
+        super().__init__(other_players, house, decks_count)
+        self.full_shoe = (4 * decks_count,) * (CATEGORIES - 2) + (4 * decks_count * 4, 4 * decks_count)
+
+    @staticmethod
+    def solver() -> Solver:
+        """Get solver shared by all instances."""
+        if OptimalAI._solver is None:
+            is_main = multiprocessing.parent_process() is None
+            OptimalAI._solver = Solver(OptimalAI.CACHE_PATH if is_main else None)
+            if OptimalAI._solver.shelf is not None:
+                atexit.register(OptimalAI._solver.close)
+        return OptimalAI._solver
+
+    def cache_state(self) -> tuple:
+        """Get unseen cards by category, rounded like the solver does."""
+        return OptimalAI.solver().rounded(self._counts())
+
+    def _counts(self) -> tuple:
+        """Get unseen cards by category, a full shoe if none are known."""
+        if self.shoe is None:
+            return self.full_shoe
+        counts = composition(self.shoe.remaining)
+        if min(counts) < 0:
+            raise ValueError(f"Shoe tracker has negative card counts {counts}!")
+        return counts if sum(counts) > 0 else self.full_shoe
+
+    def play_move(self, hand) -> Move:
+        """Play move."""
+        counts = self._counts()
+        house_card = self.house.cards[1] if self.house.cards[0].top_down else self.house.cards[0]
+        table = OptimalAI.solver().solve(counts, card_category(house_card))
+        if hand.can_split:
+            return TABLE_MOVES[table[PAIRS_OFFSET + card_category(hand.cards[0])]]
+        return TABLE_MOVES[table[min(hand.hard_score, HARD_SCORES - 1) * 2 + (hand.aces > 0)]]
+
+    def on_card_drawn(self, card) -> None:
+        """Called every time card is drawn."""
+
+    def on_game_end(self) -> None:
+        """Called on game end."""
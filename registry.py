@@ -0,0 +1,121 @@
+"""Strategy registry."""
+import ast
+import importlib
+import os
+import pkgutil
+
+# BOT value of a class setting it to an expression, found by importing the class.
+NOT_LITERAL = object()
+
+
+def _bot_value(node: ast.ClassDef):
+    """Get the BOT value set in the body of a class statement, None if it is not set there."""
+    value = None
+    for statement in node.body:
+        if isinstance(statement, ast.Assign):
+            targets = statement.targets
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            targets = [statement.target]
+        else:
+            continue
+        if any(isinstance(target, ast.Name) and target.id == "BOT" for target in targets):
+            try:
+                value = bool(ast.literal_eval(statement.value))
+            except ValueError:
+                value = NOT_LITERAL
+    return value
+
+
+class StrategyRegistry:
+    """Index of the strategy classes of a package, found once by scanning the sources without importing them.
+
+    A strategy is a class deriving from Strategy, directly or through other strategies of the package.
+    Strategies setting BOT = False, like ones that need a human, are indexed but not seated as bots.
+    Modules are parsed, not imported, and imported only when one of their strategies is loaded, or when
+    a strategy sets BOT to something other than a literal.
+    """
+
+    BASE = "Strategy"
+
+    def __init__(self, package_dir: str, package: str):
+        """Init."""
+        self.package_dir = package_dir
+        self.package = package
+        self._index = None
+        self._classes = {}
+
+    def index(self) -> dict:
+        """Get (module name, is bot) of every strategy by class name."""
+        if self._index is None:
+            classes = {}
+            for module_loader, name, is_pkg in pkgutil.iter_modules([self.package_dir]):
+                if not is_pkg:
+                    classes.update(self._scan(name))
+            # A class is a strategy if one of its bases is.
+            strategies, found = {}, True
+            while found:
+                found = False
+                for name, (module, bases, is_bot) in classes.items():
+                    if name not in strategies and (self.BASE in bases or strategies.keys() & bases):
+                        if is_bot is NOT_LITERAL:
+                            is_bot = bool(getattr(self._import(module, name), "BOT", True))
+                        parent_bots = [strategies[base][1] for base in bases if base in strategies]
+                        strategies[name] = (module, is_bot if is_bot is not None else all(parent_bots))
+                        found = True
+            self._index = strategies
+        return self._index
+
+    def _scan(self, module: str) -> dict:
+        """Get (module, base names, BOT value, None or NOT_LITERAL) of the top level classes of a module by name.
+
+        Bases are named by their last part, with names imported under an alias taken by their own name.
+        """
+        with open(os.path.join(self.package_dir, module + ".py"), encoding="utf-8") as file:
+            source = file.read()
+        classes = {}
+        if self.BASE not in source:
+            return classes
+        tree = ast.parse(source, module + ".py")
+        aliases = {alias.asname: alias.name for node in tree.body if isinstance(node, ast.ImportFrom)
+                   for alias in node.names if alias.asname}
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                bases = set()
+                for base in node.bases:
+                    if isinstance(base, ast.Name):
+                        bases.add(aliases.get(base.id, base.id))
+                    elif isinstance(base, ast.Attribute):
+                        bases.add(base.attr)
+                classes[node.name] = (module, bases, _bot_value(node))
+        return classes
+
+    @property
+    def names(self) -> list:
+        """Get names of all strategies."""
+        return list(self.index())
+
+    @property
+    def bot_names(self) -> list:
+        """Get names of the strategies that can be seated as bots."""
+        return [name for name, (module, is_bot) in self.index().items() if is_bot]
+
+    def load(self, name: str) -> type:
+        """Get strategy class by name, importing its module on first use."""
+        strategy = self._classes.get(name)
+        if strategy is None:
+            if name not in self.index():
+                raise KeyError(f"Unknown strategy {name}!")
+            strategy = self._import(self.index()[name][0], name)
+        return strategy
+
+    def _import(self, module: str, name: str) -> type:
+        """Get class of a module by name, importing the module."""
+        strategy = self._classes[name] = getattr(importlib.import_module('.' + module, self.package), name)
+        return strategy
+
+    def load_bots(self) -> list:
+        """Get classes of all strategies that can be seated as bots."""
+        return [self.load(name) for name in self.bot_names]
+
+
+STRATEGIES = StrategyRegistry(os.path.dirname(__file__), __package__)
@@ -0,0 +1,285 @@
+"""Game server for many tables.
+
+Clients talk a line based protocol over TCP:
+    client: JOIN <name> [table]      server: WELCOME <table> <coins>
+    server: TURN <score> <hand cards> / <house upcard>
+    client: <move>                   (as Move.from_str reads it, server answers ERROR <reason> to bad lines)
+    server: RESULT <outcome> <payout> <coins> <hand cards> / <house cards>
+    server: BROKE                    (coins do not cover the buy in, the connection is closed)
+    client: QUIT
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import threading
+import time
+from random import Random
+from GameOfBlackjack.blackjack import GameController, Player
+from GameOfBlackjack.game_view import Move
+from GameOfBlackjack.simulation import shard_rng
+from GameOfBlackjack.strategy import Strategy, Karmoai
+
+
+class Seat:
+    """Connection of a human player.
+
+    Moves are asked from the table's thread and answered from the event loop.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, writer: asyncio.StreamWriter, name: str, timeout: float):
+        """Init."""
+        self.loop = loop
+        self.writer = writer
+        self.name = name
+        self.timeout = timeout
+        self.connected = True
+        self.pending = None
+
+    def send(self, line: str) -> None:
+        """Send line to the client, from any thread."""
+        if self.connected:
+            self.loop.call_soon_threadsafe(self._write, line)
+
+    def _write(self, line: str) -> None:
+        """Write line in the event loop."""
+        if not self.writer.is_closing():
+            self.writer.write(line.encode() + b"\n")
+
+    def ask_move(self, hand, house) -> Move:
+        """Ask move and wait for the answer, standing if it does not come in time."""
+        self.pending = future = concurrent.futures.Future()
+        if not self.connected:
+            return Move.STAND
+        upcard = house.cards[1] if house.cards[0].top_down else house.cards[0]
+        self.send(f"TURN {hand.score} {' '.join(map(repr, hand.cards))} / {upcard!r}")
+        try:
+            return future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            return Move.STAND
+        finally:
+            self.pending = None
+
+    def answer(self, line: str) -> None:
+        """Answer the pending question with a line from the client."""
+        future = self.pending
+        if future is None:
+            self.send("ERROR not your turn")
+            return
+        try:
+            move = Move.from_str(line)
+        except ValueError:
+            self.send("ERROR invalid move")
+            return
+        self._resolve(future, move)
+
+    def disconnect(self) -> None:
+        """Mark seat as gone, a pending question is answered with stand."""
+        self.connected = False
+        if self.pending is not None:
+            self._resolve(self.pending, Move.STAND)
+
+    @staticmethod
+    def _resolve(future: concurrent.futures.Future, move: Move) -> None:
+        """Set move of a question unless it is answered already."""
+        try:
+            future.set_result(move)
+        except concurrent.futures.InvalidStateError:
+            pass
+
+
+class RemoteStrategy(Strategy):
+    """Moves of a human sitting at a server table."""
+
+    EVENTS = frozenset()
+    BOT = False
+
+    def __init__(self, other_players: list, house, decks_count: int, seat: Seat):
+        """Init."""
+        super().__init__(other_players, house, decks_count)
+        self.seat = seat
+
+    def play_move(self, hand) -> Move:
+        """Play move."""
+        return self.seat.ask_move(hand, self.house)
+
+    def on_card_drawn(self, card) -> None:
+        """Called every time card is drawn."""
+
+    def on_game_end(self) -> None:
+        """Called on game end."""
+
+
+class Table:
+    """Headless GameController played in its own thread.
+
+    Bots play inline in the thread, humans join and leave between rounds. The table waits for a joining
+    human while no human is seated.
+    """
+
+    def __init__(self, number: int, decks_count: int, bots: list, rng: Random = None,
+                 penetration: float = GameController.PENETRATION, round_delay: float = 0.0):
+        """Init."""
+        self.number = number
+        self.controller = GameController(decks_count=decks_count, buy_in_step=0, rng=rng, penetration=penetration)
+        self.controller.seat_bots(bots)
+        self.round_delay = round_delay
+        self.lock = threading.Lock()
+        # Notified when a human joins or the table is closed.
+        self.changed = threading.Condition(self.lock)
+        self.joining = []
+        self.humans = 0
+        self.rounds = 0
+        self.closed = False
+
+    def join(self, seat: Seat) -> None:
+        """Seat a human at the next round, from any thread."""
+        with self.changed:
+            self.joining.append(seat)
+            self.humans += 1
+            self.changed.notify()
+
+    def leave(self) -> None:
+        """Count a human out, the seat is removed at the next round."""
+        with self.lock:
+            self.humans -= 1
+
+    def close(self) -> None:
+        """Stop playing after the current round, from any thread."""
+        with self.changed:
+            self.closed = True
+            self.changed.notify()
+
+    def run(self) -> None:
+        """Play rounds until closed."""
+        controller = self.controller
+        while not self.closed:
+            self._update_seats()
+            if not any(isinstance(player.strategy, RemoteStrategy) for player in controller.players):
+                with self.changed:
+                    self.changed.wait_for(lambda: self.joining or self.closed)
+                continue
+            controller.play_round()
+            self.rounds += 1
+            self._send_results()
+            if self.round_delay:
+                time.sleep(self.round_delay)
+
+    def _update_seats(self) -> None:
+        """Remove humans that left or went broke and seat the joining ones."""
+        controller = self.controller
+        controller.players[:] = [player for player in controller.players
+                                 if not isinstance(player.strategy, RemoteStrategy) or player.strategy.seat.connected]
+        with self.lock:
+            joining, self.joining = self.joining, []
+        for seat in joining:
+            strategy = RemoteStrategy(controller.players, controller.house, controller.deck_ammount, seat)
+            strategy.shoe = controller.shoe
+            controller.players.append(Player(seat.name, strategy, GameController.PLAYER_START_COINS))
+            seat.send(f"WELCOME {self.number} {GameController.PLAYER_START_COINS}")
+
+    def _send_results(self) -> None:
+        """Send settled hands to humans, and close seats that cannot pay the buy in anymore."""
+        controller = self.controller
+        house = ' '.join(map(repr, controller.house.cards))
+        for player, hand, outcome, payout in controller.round_results:
+            if isinstance(player.strategy, RemoteStrategy):
+                player.strategy.seat.send(f"RESULT {outcome.value} {payout:g} {player.coins:g} "
+                                          f"{' '.join(map(repr, hand.cards))} / {house}")
+        for player in controller.players:
+            if isinstance(player.strategy, RemoteStrategy) and player.coins < controller.buy_in_cost:
+                seat = player.strategy.seat
+                seat.send("BROKE")
+                seat.loop.call_soon_threadsafe(seat.writer.close)
+                seat.connected = False
+
+
+class GameServer:
+    """Hosts tables in one process and seats connecting humans at them."""
+
+    def __init__(self, tables: int = 4, decks_count: int = 6, bots: list = None, penetration: float = 0.75,
+                 move_timeout: float = 30.0, round_delay: float = 0.0, seed=None):
+        """Init.
+
+        Every table gets the bots and its own random stream from seed (see simulation.shard_rng).
+        """
+        bots = [Karmoai] if bots is None else bots
+        self.tables = [Table(number, decks_count, bots, shard_rng(seed, number) if seed is not None else None,
+                             penetration, round_delay) for number in range(tables)]
+        self.move_timeout = move_timeout
+        self.executor = concurrent.futures.ThreadPoolExecutor(tables)
+        # Futures of the running tables, done when a table is closed or fails.
+        self.runs = []
+        self.server = None
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """Start tables and serve connections until cancelled or a table fails, raising its exception."""
+        await self.start(host, port)
+        try:
+            await asyncio.gather(self.server.serve_forever(), *self.runs)
+        finally:
+            self.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """Start tables and listen for connections."""
+        loop = asyncio.get_running_loop()
+        self.runs = [loop.run_in_executor(self.executor, table.run) for table in self.tables]
+        self.server = await asyncio.start_server(self.handle, host, port)
+
+    def close(self) -> None:
+        """Stop tables and stop listening."""
+        for table in self.tables:
+            table.close()
+        if self.server is not None:
+            self.server.close()
+        self.executor.shutdown(wait=False)
+
+    @property
+    def port(self) -> int:
+        """Get port the server listens on."""
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Seat a connecting human and pass their answers to the table."""
+        parts = (await reader.readline()).decode().split()
+        if len(parts) < 2 or parts[0].upper() != "JOIN":
+            writer.write(b"ERROR expected JOIN <name> [table]\n")
+            writer.close()
+            return
+        if len(parts) > 2 and parts[2].isdigit() and int(parts[2]) < len(self.tables):
+            table = self.tables[int(parts[2])]
+        else:
+            table = min(self.tables, key=lambda t: t.humans)
+        seat = Seat(asyncio.get_running_loop(), writer, parts[1], self.move_timeout)
+        table.join(seat)
+        try:
+            while seat.connected:
+                line = await reader.readline()
+                if not line or line.strip().upper() == b"QUIT":
+                    break
+                seat.answer(line.decode().strip())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            seat.disconnect()
+            table.leave()
+            writer.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Host blackjack tables for clients on a local port.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tables", type=int, default=4)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--bots", type=int, default=1, help="Karmoai bots at every table")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for a move")
+    parser.add_argument("--round-delay", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    game_server = GameServer(args.tables, args.decks, [Karmoai] * args.bots, move_timeout=args.timeout,
+                             round_delay=args.round_delay, seed=args.seed)
+    try:
+        asyncio.run(game_server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
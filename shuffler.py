@@ -0,0 +1,53 @@
+"""Shuffled shoes generated in bulk."""
+import numpy as np
+from GameOfBlackjack.deck import shoe_template
+
+BATCH_SIZE = 64
+
+
+class ShuffleSource:
+    """Shuffled shoes of card ids for Deck, generated in batches from a seeded, splittable random stream.
+
+    Every batch has its own generator spawned from seed, stream and batch number. Tables or workers with
+    the same seed and different streams get independent shoes, and any shoe of a stream can be replayed
+    with shoe() without generating the ones before it.
+    """
+
+    def __init__(self, deck_count: int = 1, seed: int = 0, stream: int = 0, batch_size: int = BATCH_SIZE):
+        """Init."""
+        self.deck_count = deck_count
+        self.seed = seed
+        self.stream = stream
+        self.batch_size = batch_size
+        self.template = np.frombuffer(shoe_template(deck_count), np.uint8)
+        # Count of shoes handed out, the number of the next one.
+        self.shoes = 0
+        self._batch = None
+
+    @property
+    def last_shoe(self) -> int:
+        """Get number of the last shoe handed out, or -1."""
+        return self.shoes - 1
+
+    def batch(self, number: int) -> np.ndarray:
+        """Generate a batch of shoes, one shoe per row."""
+        generator = np.random.Generator(np.random.PCG64(np.random.SeedSequence(self.seed,
+                                                                               spawn_key=(self.stream, number))))
+        return generator.permuted(np.tile(self.template, (self.batch_size, 1)), axis=1)
+
+    def next_shoe(self) -> bytearray:
+        """Get card ids of the next shoe."""
+        index = self.shoes % self.batch_size
+        if index == 0 or self._batch is None:
+            self._batch = self.batch(self.shoes // self.batch_size)
+        self.shoes += 1
+        return bytearray(self._batch[index])
+
+    def shoe(self, number: int) -> bytearray:
+        """Get card ids of any shoe of the stream again."""
+        return bytearray(self.batch(number // self.batch_size)[number % self.batch_size])
+
+
+def replay_shoe(deck_count: int, seed: int, stream: int, number: int, batch_size: int = BATCH_SIZE) -> bytearray:
+    """Get card ids of a shoe by its seed, stream and number."""
+    return ShuffleSource(deck_count, seed, stream, batch_size).shoe(number)
@@ -0,0 +1,187 @@
+"""Headless simulation."""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from GameOfBlackjack.blackjack import GameController, Outcome
+from GameOfBlackjack.memo import DecisionCache
+
+
+class SimulationConfig:
+    """Table configuration for a headless simulation."""
+
+    def __init__(self, decks_count: int = 1, strategies: list = None,
+                 start_coins: int = GameController.PLAYER_START_COINS, buy_in_step: int = GameController.BUY_IN_STEP,
+                 penetration: float = GameController.PENETRATION, shuffle_seed: int = None, memo_size: int = 0):
+        """Init.
+
+        With a shuffle seed, shoes come from a shuffler.ShuffleSource of that seed, one stream per table.
+        With a memo size, moves of cacheable strategies are memoized in a memo.DecisionCache of that size per table.
+        """
+        self.decks_count = decks_count
+        self.strategies = [] if strategies is None else strategies
+        self.start_coins = start_coins
+        self.buy_in_step = buy_in_step
+        self.penetration = penetration
+        self.shuffle_seed = shuffle_seed
+        self.memo_size = memo_size
+
+
+class PlayerResult:
+    """Aggregated results of one seat."""
+
+    def __init__(self, name: str, strategy: str, start_coins: int):
+        """Init."""
+        self.name = name
+        self.strategy = strategy
+        self.start_coins = start_coins
+        self.coins = start_coins
+        self.rounds = 0
+        self.outcomes = {outcome: 0 for outcome in Outcome}
+        # Coins sampled during the simulation, see simulate.
+        self.curve = []
+        # Tables where the seat ran out of coins for the buy in, and the first round it happened.
+        self.ruins = 0
+        self.ruined_at = None
+
+    @property
+    def hands(self) -> int:
+        """Get count of settled hands."""
+        return sum(self.outcomes.values())
+
+    @property
+    def net(self):
+        """Get coins won or lost."""
+        return self.coins - self.start_coins
+
+    def merge(self, other: "PlayerResult") -> None:
+        """Add results of the same seat from another shard."""
+        self.start_coins += other.start_coins
+        self.coins += other.coins
+        self.rounds += other.rounds
+        for outcome, count in other.outcomes.items():
+            self.outcomes[outcome] += count
+        self.curve = add_curves(self.curve, other.curve)
+        self.ruins += other.ruins
+        if other.ruined_at is not None:
+            self.ruined_at = other.ruined_at if self.ruined_at is None else min(self.ruined_at, other.ruined_at)
+
+    def __repr__(self) -> str:
+        """Repr."""
+        return f"{self.name}: {self.coins} coins after {self.rounds} rounds"
+
+
+class SimulationResult:
+    """Aggregated results of a headless simulation."""
+
+    def __init__(self, players: list, rounds: int = 0, elapsed: float = 0.0):
+        """Init."""
+        self.players = players
+        self.rounds = rounds
+        self.elapsed = elapsed
+
+    @property
+    def rounds_per_second(self) -> float:
+        """Get throughput."""
+        return self.rounds / self.elapsed if self.elapsed else 0.0
+
+
+def shard_rng(seed, shard: int) -> Random:
+    """Get independent random stream for a shard."""
+    return Random(f"{seed}:{shard}")
+
+
+def create_table(config: SimulationConfig, rng: Random = None, stream: int = 0) -> GameController:
+    """Create a headless table from config, stream is the shuffle stream of the table."""
+    shuffle_source = None
+    if config.shuffle_seed is not None:
+        from GameOfBlackjack.shuffler import ShuffleSource
+        shuffle_source = ShuffleSource(config.decks_count, config.shuffle_seed, stream)
+    controller = GameController(decks_count=config.decks_count, buy_in_step=config.buy_in_step, rng=rng,
+                                penetration=config.penetration, shuffle_source=shuffle_source)
+    controller.seat_bots(config.strategies, config.start_coins)
+    if config.memo_size:
+        cache = DecisionCache(config.memo_size)
+        for player in controller.players:
+            if player.strategy.CACHEABLE:
+                cache.attach(player.strategy)
+    return controller
+
+
+def add_curves(curve: list, other: list) -> list:
+    """Add sampled coins of two tables, a curve that ended early keeps its last value."""
+    if not curve or not other:
+        return list(curve or other)
+    length = max(len(curve), len(other))
+    curve = curve + curve[-1:] * (length - len(curve))
+    other = other + other[-1:] * (length - len(other))
+    return [a + b for a, b in zip(curve, other)]
+
+
+def simulate(config: SimulationConfig, rounds: int, rng: Random = None, curve_every: int = 0,
+             stream: int = 0, store=None) -> SimulationResult:
+    """Play up to given amount of rounds without any I/O.
+
+    The simulation stops early when nobody at the table can pay the buy in anymore.
+    With curve_every, coins of every seat are sampled after every curve_every rounds.
+    With a store (see store.SessionStore) the table is saved in batches and a stored session is resumed
+    from its last committed round, playing up to given amount of rounds in the session. The results
+    count only the rounds played in this call.
+    """
+    controller = create_table(config, rng, stream)
+    resumed = 0
+    if store is not None:
+        controller.store = store
+        resumed = store.resume(controller)
+    results = {player: PlayerResult(player.name, type(player.strategy).__name__, player.coins)
+               for player in controller.players}
+    played = 0
+    start = time.perf_counter()
+    while resumed + played < rounds and any(player.coins >= controller.buy_in_cost for player in controller.players):
+        controller.play_round()
+        played += 1
+        for player in controller.playing_players:
+            results[player].rounds += 1
+        for player, hand, outcome, payout in controller.round_results:
+            results[player].outcomes[outcome] += 1
+        for player in controller.playing_players:
+            if player.coins < controller.buy_in_cost:
+                results[player].ruins, results[player].ruined_at = 1, played
+        if curve_every and played % curve_every == 0:
+            for player, result in results.items():
+                result.curve.append(player.coins)
+    elapsed = time.perf_counter() - start
+    if store is not None:
+        store.commit(controller)
+    for player, result in results.items():
+        result.coins = player.coins
+    return SimulationResult(list(results.values()), played, elapsed)
+
+
+def _simulate_shard(args: tuple) -> SimulationResult:
+    """Play one shard in a worker process."""
+    config, rounds, seed, shard = args
+    return simulate(config, rounds, shard_rng(seed, shard), stream=shard)
+
+
+def simulate_parallel(config: SimulationConfig, rounds: int, seed: int = 0, shards: int = None,
+                      processes: int = None) -> SimulationResult:
+    """Split rounds over independent tables played in a process pool and merge their results.
+
+    Every shard is its own table with its own bankrolls and a random stream derived from seed and shard
+    number, so the same seed and shard count always give the same result, however many processes are used.
+    """
+    shards = (processes or os.cpu_count() or 1) if shards is None else shards
+    jobs = [(config, rounds // shards + (1 if shard < rounds % shards else 0), seed, shard)
+            for shard in range(shards)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(processes) as executor:
+        shard_results = list(executor.map(_simulate_shard, jobs))
+    elapsed = time.perf_counter() - start
+    merged = shard_results[0]
+    for result in shard_results[1:]:
+        merged.rounds += result.rounds
+        for player, other in zip(merged.players, result.players):
+            player.merge(other)
+    merged.elapsed = elapsed
+    return merged
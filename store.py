@@ -0,0 +1,130 @@
+"""Persistent bankrolls and round results."""
+import sqlite3
+import struct
+from GameOfBlackjack.blackjack import OUTCOME_CODES, Outcome
+from GameOfBlackjack.ledger import to_units, to_coins
+
+# Settled hand in the results of a round: seat, index in blackjack.Outcome, score, payout in chips (see ledger).
+# Hands of a seat follow each other in the order of the seat's hands.
+HAND_RESULT_FORMAT = "HBBq"
+HAND_RESULT = struct.Struct("<" + HAND_RESULT_FORMAT)
+OUTCOMES = tuple(Outcome)
+# Round number and count of settled hands of every round in a batch.
+ROUND_INDEX_FORMAT = "IH"
+ROUND_INDEX = struct.Struct("<" + ROUND_INDEX_FORMAT)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (name TEXT PRIMARY KEY, round INTEGER NOT NULL, buy_in INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS players (session TEXT NOT NULL, seat INTEGER NOT NULL, name TEXT NOT NULL,
+    strategy TEXT NOT NULL, chips INTEGER NOT NULL, PRIMARY KEY (session, seat));
+CREATE TABLE IF NOT EXISTS batches (session TEXT NOT NULL, first_round INTEGER NOT NULL, last_round INTEGER NOT NULL,
+    rounds BLOB NOT NULL, results BLOB NOT NULL, PRIMARY KEY (session, first_round));
+"""
+INSERT_BATCH = "INSERT INTO batches VALUES (?, ?, ?, ?, ?)"
+UPSERT_PLAYER = ("INSERT INTO players VALUES (?, ?, ?, ?, ?) "
+                 "ON CONFLICT (session, seat) DO UPDATE SET name = excluded.name, strategy = excluded.strategy, "
+                 "chips = excluded.chips")
+UPSERT_SESSION = ("INSERT INTO sessions VALUES (?, ?, ?) "
+                  "ON CONFLICT (name) DO UPDATE SET round = excluded.round, buy_in = excluded.buy_in")
+
+
+class SessionStore:
+    """Players, bankrolls and round results of a table session in SQLite, all amounts in chips (see ledger).
+
+    Results of the rounds are kept in memory as flat values and written with the bankrolls in one
+    transaction every batch_rounds rounds, so a crashed session resumes from the last committed round.
+    A batch is one row, holding ROUND_INDEX records of its rounds and HAND_RESULT records of their hands,
+    all packed at commit. The database runs in WAL mode.
+    """
+
+    def __init__(self, path: str, session: str = "default", batch_rounds: int = 100):
+        """Init."""
+        self.session = session
+        self.batch_rounds = batch_rounds
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        # Round numbers and hand counts, and the HAND_RESULT values of the rounds not committed yet.
+        self.rounds = []
+        self.results = []
+        # Players of the table and their seats, looked up once per change of the players.
+        self.seated = []
+        self.seats = {}
+
+    def record_round(self, controller) -> None:
+        """Add results of the last round of a controller, committing every batch_rounds rounds."""
+        players = controller.players
+        if self.seated != players:
+            self.seated = list(players)
+            self.seats = {player: seat for seat, player in enumerate(players)}
+        seats = self.seats
+        results = self.results
+        entries = controller.ledger.entries
+        for player, hand, stake, outcome, payout in entries:
+            results += (seats[player], OUTCOME_CODES[outcome], hand.score, payout)
+        self.rounds += (controller.round_number, len(entries))
+        if len(self.rounds) >= 2 * self.batch_rounds:
+            self.commit(controller)
+
+    def commit(self, controller) -> None:
+        """Write pending results and the bankrolls of a controller in one transaction."""
+        rounds, results = self.rounds, self.results
+        with self.connection:
+            if rounds:
+                # Every batch is packed by one call, with a format repeated for all of its rounds and hands.
+                self.connection.execute(INSERT_BATCH, (
+                    self.session, rounds[0], rounds[-2],
+                    struct.pack("<" + ROUND_INDEX_FORMAT * (len(rounds) // 2), *rounds),
+                    struct.pack("<" + HAND_RESULT_FORMAT * sum(rounds[1::2]), *results)))
+            self.connection.executemany(UPSERT_PLAYER, [
+                (self.session, seat, player.name, type(player.strategy).__name__, player.chips)
+                for seat, player in enumerate(controller.players)])
+            self.connection.execute(UPSERT_SESSION, (self.session, controller.round_number,
+                                                     to_units(controller.buy_in_cost)))
+        self.rounds = []
+        self.results = []
+
+    def resume(self, controller) -> int:
+        """Restore bankrolls, round number and buy in of a controller from the session, get the round.
+
+        Players are matched by seat and must have the names they were stored with.
+        """
+        row = self.connection.execute("SELECT round, buy_in FROM sessions WHERE name = ?",
+                                      (self.session,)).fetchone()
+        if row is None:
+            return 0
+        for seat, name, chips in self.connection.execute("SELECT seat, name, chips FROM players WHERE session = ?",
+                                                         (self.session,)):
+            if seat >= len(controller.players) or controller.players[seat].name != name:
+                raise ValueError(f"Seat {seat} of the session is not {name}!")
+            controller.players[seat].chips = chips
+        controller.round_number = row[0]
+        controller.buy_in_cost = to_coins(row[1])
+        return controller.round_number
+
+    def round_results(self, round_number: int) -> list:
+        """Get (seat, hand index, outcome, score, payout in chips) of the hands settled in a committed round."""
+        row = self.connection.execute("SELECT rounds, results FROM batches WHERE session = ? AND first_round <= ? "
+                                      "AND last_round >= ?", (self.session, round_number, round_number)).fetchone()
+        if row is None:
+            return []
+        offset = 0
+        for number, hands in ROUND_INDEX.iter_unpack(row[0]):
+            if number == round_number:
+                results = []
+                last, hand_index = -1, 0
+                for seat, outcome, score, payout in HAND_RESULT.iter_unpack(
+                        row[1][offset:offset + hands * HAND_RESULT.size]):
+                    hand_index = hand_index + 1 if seat == last else 0
+                    last = seat
+                    results.append((seat, hand_index, OUTCOMES[outcome], score, payout))
+                return results
+            offset += hands * HAND_RESULT.size
+        return []
+
+    def close(self, controller=None) -> None:
+        """Commit pending results of a controller and close the database."""
+        if controller is not None:
+            self.commit(controller)
+        self.connection.close()
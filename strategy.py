@@ -1,53 +1,67 @@
 """Strategy."""
 from abc import abstractmethod
 from GameOfBlackjack.game_view import GameView, Move
-from random import choice
-
-
-class Card:
-    """Dataclass for holding card information."""
-
-    def __init__(self, value: str, suit: str, code: str, top_down=False):
-        """Constructor."""
-        self.value = value
-        self.suit = suit
-        self.code = code
-        self.top_down = top_down
-
-    def __str__(self):
-        """Str."""
-        return "??" if self.top_down else self.code
-
-    def __repr__(self) -> str:
-        """Repr."""
-        return self.code
-
-    def __eq__(self, o) -> bool:
-        """Eq."""
-        return isinstance(o, Card) and o.suit == self.suit and o.value == self.value
+from GameOfBlackjack.deck import generate_pile, VALUES
+from random import Random
 
 
 def generate_pack(deck_count):
     """Generate backup pile."""
-    card_pile = []
-    suits = {"S": "SPADES", "D": 'DIAMONDS', 'H': 'HEARTS', 'C': 'CLUBS'}
-    values = {"J": "JACK", "Q": "QUEEN", "K": "KING", "A": "ACE", "2": "2", "3": "3", "4": "4", "5": "5", "6": "6",
-              "7": "7", "8": "8", "9": "9", "0": "10"}
-    codes = ['AS', '2S', '3S', '4S', '5S', '6S', '7S', '8S', '9S', '0S', 'JS', 'QS', 'KS', 'AD', '2D', '3D', '4D',
-             '5D', '6D', '7D', '8D', '9D', '0D', 'JD', 'QD', 'KD', 'AC', '2C', '3C', '4C', '5C', '6C', '7C', '8C',
-             '9C', '0C', 'JC', 'QC', 'KC', 'AH', '2H', '3H', '4H', '5H', '6H', '7H', '8H', '9H', '0H', 'JH', 'QH',
-             'KH']
-    for times in range(deck_count):
-        for code in codes:
-            suit = suits[code[-1]]
-            value = values[code[0]]
-            card = Card(value, suit, code)
-            card_pile.append(card)
-    return card_pile
+    return generate_pile(deck_count)
+
+
+ONE_SOFT = {12: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 13: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 14: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 15: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],16: ['H', 'S', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 17: ['D', 'D', 'D', 'D', 'D', 'S', 'S', 'H', 'H', 'H'], 18: ['S', 'D', 'D', 'D', 'D', 'S', 'S', 'H', 'H', 'S'], 19: ['S', 'S', 'S', 'S', 'D', 'S', 'S', 'S', 'S', 'S']}
+ONE_HARD = {4: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 5: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 6: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 7: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 8: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 9: ['D', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 10: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], 11: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D'], 12: ['H', 'H', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 13: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 14: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 15: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 16: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'Q', 'Q'], 17: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 18: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 20: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 21: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
+ONE_SPLIT = {"2": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "3": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H'], "4": ['H', 'H', 'X', 'X', 'X', 'H', 'H', 'H', 'H', 'H'], "5": ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], "6": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "7": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'H', 'Q', 'H'],  "8": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "9": ['X', 'X', 'X', 'X', 'X', 'S', 'X', 'X', 'S', 'S'], "1": ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'],  "J": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "Q": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "K": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'],  "A": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X']}
+TWO_SOFT = {12: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 13: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],  14: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],  15: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 16: ['H', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 17: ['H', 'D', 'D', 'D', 'D', 'S', 'S', 'H', 'H', 'H'], 18: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
+TWO_HARD = {4: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 5: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'],  6: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'],  7: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 8: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 9: ['D', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 10: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], 11: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D'],  12: ['H', 'H', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'],  13: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 14: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 15: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'Q', 'H'], 16: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'Q', 'Q'], 17: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 18: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 20: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 21: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
+TWO_SPLIT = {"2": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "3": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "4": ['H', 'H', 'H', 'X', 'X', 'H', 'H', 'H', 'H', 'H'],  "5": ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], "6": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "7": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'H', 'Q', 'H'], "8": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "9": ['X', 'X', 'X', 'X', 'X', 'S', 'X', 'X', 'S', 'S'],  "1": ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], "J": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "Q": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "K": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "A": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X']}
+ELSE_SOFT = {12: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 13: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 14: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],  15: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 16: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 17: ['H', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],  18: ['S', 'D', 'D', 'D', 'D', 'S', 'S', 'H', 'H', 'H'],  19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
+ELSE_HARD = {4: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 5: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 6: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 7: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 8: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 9: ['H', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 10: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], 11: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H'], 12: ['H', 'H', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 13: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 14: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 15: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'Q', 'H'], 16: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'Q', 'Q', 'Q'], 17: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 18: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 20: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 21: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
+ELSE_SPLIT = {"2": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'],  "3": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "4": ['H', 'H', 'H', 'X', 'X', 'H', 'H', 'H', 'H', 'H'],  "5": ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'],  "6": ['X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H', 'H'],  "7": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'Q', 'H'],  "8": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "9": ['X', 'X', 'X', 'X', 'X', 'S', 'X', 'X', 'S', 'S'], "1": ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], "J": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "Q": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'],  "K": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "A": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X']}
+# Tables by deck count, None is used for every other deck count.
+KARMOAI_TABLES = {1: (ONE_SOFT, ONE_HARD, ONE_SPLIT), 2: (TWO_SOFT, TWO_HARD, TWO_SPLIT),
+                  None: (ELSE_SOFT, ELSE_HARD, ELSE_SPLIT)}
+
+# Compiled table rows: hard scores, soft scores and pair ranks, each row has a move per upcard (2-10, ace).
+TABLE_MOVES = (Move.HIT, Move.STAND, Move.DOUBLE_DOWN, Move.SURRENDER, Move.SPLIT)
+TABLE_CODES = "HSDQX"
+UPCARDS = 10
+SOFT_ROWS = 32
+SPLIT_ROWS = 2 * SOFT_ROWS
+
+
+def compile_table(soft_hand_dict: dict, hard_hand_dict: dict, split_hand: dict) -> bytes:
+    """Compile decision dicts to a flat table of TABLE_MOVES indexes."""
+    table = bytearray([TABLE_CODES.index("S")]) * ((SPLIT_ROWS + len(VALUES)) * UPCARDS)
+    rows = [(score, row) for score, row in hard_hand_dict.items()]
+    rows += [(SOFT_ROWS + score, row) for score, row in soft_hand_dict.items()]
+    rows += [(SPLIT_ROWS + rank, split_hand[value[0]]) for rank, value in enumerate(VALUES)]
+    for index, row in rows:
+        table[index * UPCARDS:(index + 1) * UPCARDS] = bytes(TABLE_CODES.index(move) for move in row)
+    return bytes(table)
+
+
+# Events a strategy can listen to.
+CARD_DRAWN = "CARD DRAWN"
+CARDS_DEALT = "CARDS DEALT"
+GAME_END = "GAME END"
+SHUFFLE = "SHUFFLE"
+EVENTS = (CARD_DRAWN, CARDS_DEALT, GAME_END, SHUFFLE)
 
 
 class Strategy:
-    """Strategy."""
+    """Strategy.
+
+    The table calls only the hooks of the events listed in EVENTS.
+    Strategies with BOT = False are not seated as bots by GameController.load_strategies.
+    Strategies with CACHEABLE = True choose moves only by the ranks of the hand's cards, the house upcard,
+    decks count and cache_state(), so their moves can be memoized (see memo.DecisionCache).
+    """
+
+    EVENTS = frozenset({CARD_DRAWN, GAME_END})
+    BOT = True
+    CACHEABLE = False
 
     def __init__(self, other_players: list, house, decks_count: int):
         """Init."""
@@ -55,10 +69,13 @@ class Strategy:
         self.house = house
         self.decks_count = decks_count
         self.other_players = other_players
+        self.rng = Random()
+        # Composition of the unseen cards of the table's shoe (deck.ShoeTracker), shared by all seats.
+        self.shoe = None
 
     @abstractmethod
     def on_card_drawn(self, card) -> None:
-        """Called every time when card is drawn."""
+        """Called every time when card is drawn face up, and with the house hole card when it is revealed."""
 
     @abstractmethod
     def play_move(self, hand) -> Move:
@@ -68,79 +85,68 @@ class Strategy:
     def on_game_end(self) -> None:
         """Called on game end."""
 
+    def on_cards_dealt(self, cards: list) -> None:
+        """Called with all cards drawn in a phase of the round: the deal, the players' turns and the house.
+
+        The list is reused by the table, so copy it to keep the cards.
+        """
+
+    def on_shuffle(self) -> None:
+        """Called when the shoe is shuffled."""
+
+    def cache_state(self) -> tuple:
+        """Get other state the moves depend on, as a hashable value."""
+        return ()
 
 
 class Karmoai(Strategy):
     """Very simple strategy."""
 
+    EVENTS = frozenset()
+    CACHEABLE = True
+
+    _compiled_tables = {}
+
     def __init__(self, other_players: list, house, decks_count):
         """Init."""
         super().__init__(other_players, house, decks_count)
-        self.used_cards = []
-        self.card_pack = generate_pack(decks_count)
-        one_soft = {12: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 13: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 14: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 15: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],16: ['H', 'S', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 17: ['D', 'D', 'D', 'D', 'D', 'S', 'S', 'H', 'H', 'H'], 18: ['S', 'D', 'D', 'D', 'D', 'S', 'S', 'H', 'H', 'S'], 19: ['S', 'S', 'S', 'S', 'D', 'S', 'S', 'S', 'S', 'S']}
-        one_hard = {4: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 5: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 6: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 7: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 8: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 9: ['D', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 10: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], 11: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D'], 12: ['H', 'H', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 13: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 14: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 15: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 16: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'Q', 'Q'], 17: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 18: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 20: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 21: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
-        one_split = {"2": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "3": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H'], "4": ['H', 'H', 'X', 'X', 'X', 'H', 'H', 'H', 'H', 'H'], "5": ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], "6": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "7": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'H', 'Q', 'H'],  "8": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "9": ['X', 'X', 'X', 'X', 'X', 'S', 'X', 'X', 'S', 'S'], "1": ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'],  "J": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "Q": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "K": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'],  "A": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X']}
-        two_soft = {12: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 13: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],  14: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],  15: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 16: ['H', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 17: ['H', 'D', 'D', 'D', 'D', 'S', 'S', 'H', 'H', 'H'], 18: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
-        two_hard = {4: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 5: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'],  6: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'],  7: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 8: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 9: ['D', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 10: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], 11: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D'],  12: ['H', 'H', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'],  13: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 14: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 15: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'Q', 'H'], 16: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'Q', 'Q'], 17: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 18: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 20: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 21: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
-        two_split = {"2": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "3": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "4": ['H', 'H', 'H', 'X', 'X', 'H', 'H', 'H', 'H', 'H'],  "5": ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], "6": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "7": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'H', 'Q', 'H'], "8": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "9": ['X', 'X', 'X', 'X', 'X', 'S', 'X', 'X', 'S', 'S'],  "1": ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], "J": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "Q": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "K": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "A": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X']}
-        else_soft = {12: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 13: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 14: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],  15: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 16: ['H', 'H', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 17: ['H', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'],  18: ['S', 'D', 'D', 'D', 'D', 'S', 'S', 'H', 'H', 'H'],  19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
-        else_hard = {4: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 5: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 6: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 7: ['H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H'], 8: ['H', 'H', 'H', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 9: ['H', 'D', 'D', 'D', 'D', 'H', 'H', 'H', 'H', 'H'], 10: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'], 11: ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H'], 12: ['H', 'H', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 13: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 14: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'H', 'H'], 15: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'H', 'Q', 'H'], 16: ['S', 'S', 'S', 'S', 'S', 'H', 'H', 'Q', 'Q', 'Q'], 17: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 18: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 19: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 20: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], 21: ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S']}
-        else_split = {"2": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'],  "3": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H'], "4": ['H', 'H', 'H', 'X', 'X', 'H', 'H', 'H', 'H', 'H'],  "5": ['D', 'D', 'D', 'D', 'D', 'D', 'D', 'D', 'H', 'H'],  "6": ['X', 'X', 'X', 'X', 'X', 'H', 'H', 'H', 'H', 'H'],  "7": ['X', 'X', 'X', 'X', 'X', 'X', 'H', 'H', 'Q', 'H'],  "8": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "9": ['X', 'X', 'X', 'X', 'X', 'S', 'X', 'X', 'S', 'S'], "1": ['S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S', 'S'], "J": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "Q": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'],  "K": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X'], "A": ['X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X', 'X']}
-        if decks_count == 1:
-            self.soft_hand_dict = one_soft
-            self.hard_hand_dict = one_hard
-            self.split_hand = one_split
-        elif decks_count == 2:
-            self.soft_hand_dict = two_soft
-            self.hard_hand_dict = two_hard
-            self.split_hand = two_split
-        else:
-            self.soft_hand_dict = else_soft
-            self.hard_hand_dict = else_hard
-            self.split_hand = else_split
-
+        self.soft_hand_dict, self.hard_hand_dict, self.split_hand = KARMOAI_TABLES.get(decks_count,
+                                                                                      KARMOAI_TABLES[None])
+        self.table = Karmoai.compiled_table(decks_count)
+
+    @staticmethod
+    def compiled_table(decks_count: int) -> bytes:
+        """Get decision table of given deck count, compiled once and shared by all instances."""
+        key = decks_count if decks_count in KARMOAI_TABLES else None
+        if key not in Karmoai._compiled_tables:
+            Karmoai._compiled_tables[key] = compile_table(*KARMOAI_TABLES[key])
+        return Karmoai._compiled_tables[key]
 
     def play_move(self, hand) -> Move:
         """Get next move."""
-        code = [card.__str__() for card in self.house.cards]
-        house_card_value = code[0] if code[0] != "??" else code[1]
-        hand_host = {"2": 0, "3": 1, "4": 2, "5": 3, "6": 4, "7": 5, "8": 6, "9": 7, "0": 8, "J": 8, "Q": 8, "K": 8,
-                     'A': 9}
-        self.host_hand_index = hand_host[house_card_value[0]]
+        house_card = self.house.cards[1] if self.house.cards[0].top_down else self.house.cards[0]
         if hand.can_split:
-            response = self.split_hand[hand.cards[0].value[0]]
-        elif hand.is_soft_hand and hand.score in range(12, 20):
-            response = self.soft_hand_dict[hand.score][self.host_hand_index]
+            row = SPLIT_ROWS + hand.cards[0].rank
+        elif hand.is_soft_hand and 12 <= hand.score < 20:
+            row = SOFT_ROWS + hand.score
         elif hand.score < 21:
-            response = self.hard_hand_dict[hand.score][self.host_hand_index]
+            row = hand.score
         else:
-            response = "S"
-        response = choice(response)
-        if response == "H":
-            return Move.HIT
-        if response == "D":
-            return Move.DOUBLE_DOWN
-        if response == "Q":
-            return Move.SURRENDER
-        if response == "S":
             return Move.STAND
-        if response == "X":
-            return Move.SPLIT
+        return TABLE_MOVES[self.table[row * UPCARDS + house_card.points - 2]]
 
     def on_card_drawn(self, card) -> None:
         """Called every time card is drawn."""
-        self.used_cards.append(card)
-        if card in self.card_pack:
-            self.card_pack.remove(card)
 
     def on_game_end(self) -> None:
         """Called on game end."""
-        self.used_cards = []
 
 class HumanStrategy(Strategy):
     """Human strategy."""
 
+    EVENTS = frozenset()
+    BOT = False
+
     def __init__(self, other_players: list, house, decks_count, view: GameView):
         """Init."""
         super().__init__(other_players, house, decks_count)
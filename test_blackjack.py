@@ -0,0 +1,62 @@
+"""Tests of the game controller."""
+from collections import Counter
+from random import Random
+import pytest
+from GameOfBlackjack.simulation import SimulationConfig, create_table
+from GameOfBlackjack.strategy import Karmoai, CARD_DRAWN, CARDS_DEALT, GAME_END, SHUFFLE
+
+
+class Watcher(Karmoai):
+    """Karmoai remembering every card it is shown, and whether the hole card was shown before its reveal."""
+
+    EVENTS = frozenset({CARD_DRAWN, CARDS_DEALT, GAME_END, SHUFFLE})
+
+    def __init__(self, other_players: list, house, decks_count: int):
+        """Init."""
+        super().__init__(other_players, house, decks_count)
+        self.drawn = []
+        self.dealt = []
+        self.face_down = 0
+        self.hole_card_seen = 0
+
+    def on_card_drawn(self, card) -> None:
+        """Remember card."""
+        super().on_card_drawn(card)
+        self.face_down += card.top_down
+        self.drawn.append(card.id)
+
+    def on_cards_dealt(self, cards: list) -> None:
+        """Remember cards."""
+        self.face_down += sum(card.top_down for card in cards)
+        self.dealt += [card.id for card in cards]
+
+    def on_shuffle(self) -> None:
+        """Forget cards of the old shoe."""
+        self.drawn.clear()
+        self.dealt.clear()
+
+    def play_move(self, hand):
+        """Check the hole card is not shown yet, ids are unique within a single deck shoe."""
+        hole_card = self.house.cards[0]
+        self.hole_card_seen += hole_card.id in self.drawn or hole_card.id in self.dealt
+        return super().play_move(hand)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_hole_card_shown_only_when_revealed(seed):
+    """Strategies are shown face up cards only, and the hole card once it is revealed."""
+    table = create_table(SimulationConfig(1, [Watcher, Watcher], start_coins=10 ** 6, buy_in_step=0,
+                                          penetration=0.5), Random(seed))
+    watchers = [player.strategy for player in table.players]
+    for x in range(300):
+        shuffles = table.shuffles
+        table.play_round()
+        cards = [card.id for player in table.playing_players for hand in player.hands for card in hand.cards]
+        cards += [card.id for card in table.house.cards]
+        for watcher in watchers:
+            assert watcher.face_down == 0
+            assert watcher.hole_card_seen == 0
+            if table.shuffles == shuffles:
+                # Every card of the round is shown once, the hole card included.
+                assert Counter(watcher.drawn[-len(cards):]) == Counter(cards)
+                assert Counter(watcher.dealt[-len(cards):]) == Counter(cards)
@@ -0,0 +1,98 @@
+"""Tests of the house outcome probabilities."""
+from random import Random
+import pytest
+from GameOfBlackjack.blackjack import Hand
+from GameOfBlackjack.dealer import house_probabilities, house_probabilities_without_depletion, OUTCOMES, \
+    CATEGORIES, ACE_CATEGORY, BLACKJACK, BUST, RANK_CATEGORIES
+from GameOfBlackjack.deck import CARDS
+
+
+def full_shoe(decks: int) -> tuple:
+    """Get card counts by category of a full shoe."""
+    return (4 * decks,) * (CATEGORIES - 2) + (16 * decks, 4 * decks)
+
+
+# One card of every category.
+CATEGORY_CARDS = [next(card for card in CARDS if RANK_CATEGORIES[card.rank] == category)
+                  for category in range(CATEGORIES)]
+
+
+def brute_force(counts: tuple, upcard: int) -> list:
+    """Get house result probabilities by walking every draw order, without any memo."""
+    def walk(counts: tuple, cards: list) -> list:
+        hand = Hand(cards)
+        result = [0.0] * len(OUTCOMES)
+        if hand.score > 21:
+            result[BUST] = 1.0
+        elif len(cards) > 1 and not (hand.score < 17 or hand.is_soft_hand and hand.score < 18):
+            result[BLACKJACK if hand.is_blackjack else hand.score - 17] = 1.0
+        else:
+            total = sum(counts)
+            for category, count in enumerate(counts):
+                if count:
+                    rest = counts[:category] + (count - 1,) + counts[category + 1:]
+                    for outcome, probability in enumerate(walk(rest, cards + [CATEGORY_CARDS[category]])):
+                        result[outcome] += count / total * probability
+        return result
+    return walk(counts, [CATEGORY_CARDS[upcard]])
+
+
+def monte_carlo(counts: tuple, upcard: int, trials: int, rng: Random) -> list:
+    """Get house result shares of trials played like GameController plays the house."""
+    pile = [category for category, count in enumerate(counts) for x in range(count)]
+    results = [0] * len(OUTCOMES)
+    for x in range(trials):
+        hand = Hand([CATEGORY_CARDS[upcard]])
+        for category in rng.sample(pile, 12):
+            if len(hand.cards) > 1 and not (hand.score < 17 or hand.is_soft_hand and hand.score < 18):
+                break
+            hand.add_card(CATEGORY_CARDS[category])
+        if hand.score > 21:
+            results[BUST] += 1
+        else:
+            results[BLACKJACK if hand.is_blackjack else hand.score - 17] += 1
+    return [count / trials for count in results]
+
+
+@pytest.mark.parametrize("upcard", range(CATEGORIES))
+def test_matches_brute_force(upcard):
+    """Exact probabilities of depleted single deck shoes match walking every draw order."""
+    rng = Random(upcard)
+    counts = list(full_shoe(1))
+    for x in range(20):
+        counts[rng.choice([category for category, count in enumerate(counts) if count])] -= 1
+    counts = tuple(counts)
+    assert house_probabilities(counts, upcard) == pytest.approx(brute_force(counts, upcard), abs=1e-12)
+
+
+@pytest.mark.parametrize("upcard", range(CATEGORIES))
+def test_matches_monte_carlo(upcard):
+    """Exact probabilities of a full shoe match the results of played house hands."""
+    counts = full_shoe(1)
+    played = monte_carlo(counts, upcard, 20000, Random(upcard))
+    assert house_probabilities(counts, upcard) == pytest.approx(played, abs=0.015)
+
+
+@pytest.mark.parametrize("upcard", range(CATEGORIES))
+def test_large_shoe_matches_without_depletion(upcard):
+    """Depletion by the house's own cards barely matters in a very large shoe."""
+    counts = full_shoe(2000)
+    exact = house_probabilities(counts, upcard)
+    assert sum(exact) == pytest.approx(1.0)
+    assert exact == pytest.approx(house_probabilities_without_depletion(counts, upcard), abs=1e-3)
+
+
+def test_without_depletion_differs_in_small_shoe():
+    """In a single deck the house's own cards change the odds."""
+    counts = full_shoe(1)
+    exact = house_probabilities(counts, ACE_CATEGORY)
+    assert exact != pytest.approx(house_probabilities_without_depletion(counts, ACE_CATEGORY), abs=1e-3)
+
+
+def test_nearly_empty_shoe():
+    """Paths that empty the shoe are left out."""
+    # 7 up: an ace first stands on 18, a 9 first hits 17 with the ace and runs out of cards.
+    counts = (0,) * (CATEGORIES - 3) + (1, 0, 1)
+    exact = house_probabilities(counts, 5)
+    assert exact == pytest.approx(brute_force(counts, 5), abs=1e-12)
+    assert sum(exact) == pytest.approx(0.5)
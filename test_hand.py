@@ -0,0 +1,92 @@
+"""Tests of hand scoring against the scoring hands had before totals were kept incrementally."""
+from itertools import combinations_with_replacement, product
+from GameOfBlackjack.blackjack import Hand
+from GameOfBlackjack.deck import Card, CARD_RANKS, VALUES
+
+# One card of every rank, ace first.
+RANK_CARDS = [Card(CARD_RANKS.index(rank)) for rank in range(len(VALUES))]
+TENS = {"10", "JACK", "QUEEN", "KING"}
+
+
+def reference_score(values: list) -> int:
+    """Get score of card values, counting aces as 11 while the hand stays at 21 or below."""
+    score = 0
+    ace_score = 0
+    for value in values:
+        if value.isdigit():
+            score += int(value)
+        elif value != "ACE":
+            score += 10
+        else:
+            ace_score += 11
+    for x in range(ace_score // 11):
+        if score + ace_score < 22:
+            return score + ace_score
+        ace_score -= 10
+    return score + ace_score
+
+
+def reference(values: list) -> tuple:
+    """Get score, is soft hand, is blackjack and can split of card values."""
+    is_soft_hand = "ACE" in values
+    is_blackjack = len(values) == 2 and is_soft_hand and bool(set(values) & TENS)
+    can_split = len(values) == 2 and values[0] == values[1]
+    return reference_score(values), is_soft_hand, is_blackjack, can_split
+
+
+def compositions():
+    """Get every ordered hand of one to four cards and every five card hand, by rank."""
+    for count in range(1, 5):
+        yield from product(range(len(VALUES)), repeat=count)
+    yield from combinations_with_replacement(range(len(VALUES)), 5)
+
+
+def assert_matches(hand: Hand, ranks: tuple) -> None:
+    """Check hand against the reference scoring of its ranks."""
+    expected = reference([VALUES[rank] for rank in ranks])
+    assert (hand.score, hand.is_soft_hand, hand.is_blackjack, hand.can_split) == expected, ranks
+
+
+def test_every_composition():
+    """Hands built card by card score like the reference."""
+    for ranks in compositions():
+        hand = Hand()
+        for rank in ranks:
+            hand.add_card(RANK_CARDS[rank])
+        assert_matches(hand, ranks)
+
+
+def test_every_composition_from_constructor():
+    """Hands built from a list of cards score like the reference."""
+    for ranks in compositions():
+        assert_matches(Hand([RANK_CARDS[rank] for rank in ranks]), ranks)
+
+
+def test_reused_hand():
+    """A reset hand scores like a new one."""
+    hand = Hand()
+    for ranks in compositions():
+        hand.reset()
+        for rank in ranks:
+            hand.add_card(RANK_CARDS[rank])
+        assert_matches(hand, ranks)
+
+
+def test_split_hands():
+    """Both hands of a split pair score like the reference after drawing."""
+    for rank, first, second in product(range(len(VALUES)), repeat=3):
+        hand = Hand([RANK_CARDS[rank], RANK_CARDS[rank]])
+        new_hand = hand.split(Hand())
+        hand.add_card(RANK_CARDS[first])
+        new_hand.add_card(RANK_CARDS[second])
+        assert_matches(hand, (rank, first))
+        assert_matches(new_hand, (rank, second))
+
+
+def test_double_down():
+    """Doubling down adds the card like a hit."""
+    for ranks in product(range(len(VALUES)), repeat=3):
+        hand = Hand([RANK_CARDS[rank] for rank in ranks[:2]])
+        hand.double_down(RANK_CARDS[ranks[2]])
+        assert hand.is_double_down
+        assert_matches(hand, ranks)
@@ -0,0 +1,100 @@
+"""Tests of the hand history log."""
+from random import Random
+import pytest
+from GameOfBlackjack.blackjack import GameController, OUTCOME_CODES
+from GameOfBlackjack.history import HistoryWriter, HistoryReader, HEADER, RECORD, ROUND, CARD, MOVE, PAYOUT, HOUSE, \
+    MAX_SEATS, decode
+from GameOfBlackjack.ledger import to_units
+from GameOfBlackjack.strategy import Karmoai
+
+
+def test_round_trip(tmp_path):
+    """Records of played rounds read back as written, with amounts in chips."""
+    path = tmp_path / "history.bin"
+    writer = HistoryWriter(str(path), buffer_records=16)
+    table = GameController(decks_count=2, rng=Random(1), history=writer)
+    table.seat_bots([Karmoai] * 3, 10 ** 6)
+    results = []
+    for x in range(50):
+        table.play_round()
+        cards = [[card.id for hand in player.hands for card in hand.cards] for player in table.playing_players]
+        results.append((table.round_number, to_units(table.buy_in_cost - table.buy_in_step), cards,
+                        [card.id for card in table.house.cards],
+                        [(OUTCOME_CODES[outcome], hand.score, payout)
+                         for player, hand, stake, outcome, payout in table.ledger.entries]))
+    writer.close()
+
+    reader = HistoryReader(str(path))
+    try:
+        assert path.stat().st_size == HEADER.size + len(reader) * RECORD.size
+        rounds = list(reader.rounds())
+        assert len(rounds) == 50
+        for records, (round_number, buy_in, cards, house, payouts) in zip(rounds, results):
+            kind, seats, hand, code, value, amount = records[0]
+            assert (kind, seats, value, amount) == (ROUND, 3, round_number, buy_in)
+            assert [record[3] for record in records if record[0] == CARD and record[1] == HOUSE] == house
+            for seat, seat_cards in enumerate(cards):
+                assert [record[3] for record in records if record[0] == CARD and record[1] == seat] == seat_cards
+            assert [record[3:] for record in records if record[0] == PAYOUT] == payouts
+            assert all(record[0] in (ROUND, CARD, MOVE, PAYOUT) for record in records)
+        assert sum(decode(record).amount for record in reader if record[0] == PAYOUT) == table.ledger.paid
+        assert decode(reader[0]).kind == ROUND
+    finally:
+        reader.close()
+
+
+def test_appends_to_existing_file(tmp_path):
+    """A second writer continues the file after its records."""
+    path = str(tmp_path / "history.bin")
+    for round_number in (1, 2):
+        writer = HistoryWriter(path)
+        writer.write(ROUND, 1, 0, 0, round_number, 500)
+        writer.close()
+    reader = HistoryReader(path)
+    try:
+        assert [decode(record).value for record in reader] == [1, 2]
+    finally:
+        reader.close()
+
+
+def test_many_seats(tmp_path):
+    """Seats past 255 are kept apart from the house."""
+    path = str(tmp_path / "history.bin")
+    writer = HistoryWriter(path)
+    writer.write(ROUND, 300, 0, 0, 1, 500)
+    writer.write(CARD, 255, 0, 7)
+    writer.write(CARD, 299, 0, 8)
+    writer.write(CARD, HOUSE, 0, 9)
+    with pytest.raises(ValueError):
+        writer.write(ROUND, MAX_SEATS + 1)
+    writer.close()
+    reader = HistoryReader(path)
+    try:
+        assert [(record[1], record[3]) for record in list(reader)[1:]] == [(255, 7), (299, 8), (HOUSE, 9)]
+    finally:
+        reader.close()
+
+
+def test_empty_file(tmp_path):
+    """A new file holds only the header."""
+    path = str(tmp_path / "history.bin")
+    HistoryWriter(path).close()
+    reader = HistoryReader(path)
+    try:
+        assert len(reader) == 0
+        assert list(reader.rounds()) == []
+    finally:
+        reader.close()
+
+
+def test_rejects_other_files(tmp_path):
+    """Files without the header of this format are not read or appended to."""
+    path = tmp_path / "history.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        HistoryReader(str(path))
+    with pytest.raises(ValueError):
+        HistoryWriter(str(path))
+    path.write_bytes(HEADER.pack(b"BJHL", 1, 16))
+    with pytest.raises(ValueError):
+        HistoryReader(str(path))
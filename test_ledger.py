@@ -0,0 +1,99 @@
+"""Tests of settling hands in chips."""
+import pytest
+from GameOfBlackjack.blackjack import Hand, Player, Outcome
+from GameOfBlackjack.deck import CARDS, CARD_RANKS, VALUES
+from GameOfBlackjack.ledger import Ledger, to_units, to_coins, UNITS_PER_COIN
+
+
+def hand(*values: str, stake: int = 500) -> Hand:
+    """Get hand of cards by value names with a stake in chips."""
+    result = Hand([CARDS[CARD_RANKS.index(VALUES.index(value))] for value in values])
+    result.stake = stake
+    return result
+
+
+def settle(house: Hand, *hands: Hand, chips: int = 0) -> tuple:
+    """Settle hands of one player against the house, get the player and the entries."""
+    player = Player("Player", None, 0)
+    player.chips = chips
+    player.hands = list(hands)
+    return player, Ledger(Outcome).settle([player], house)
+
+
+def test_units():
+    """Coins convert to chips and back without loss."""
+    assert to_units(5) == 5 * UNITS_PER_COIN
+    assert to_units(12.5) == 1250
+    assert to_coins(1250) == 12.5
+    assert to_coins(500) == 5 and isinstance(to_coins(500), int)
+
+
+@pytest.mark.parametrize("stake, payout", [(500, 1250), (700, 1750), (100, 250), (1, 2), (333, 832)])
+def test_blackjack_pays_3_to_2(stake, payout):
+    """Blackjack pays the stake and one and a half times it, odd coin stakes exactly, half chips to the house."""
+    player, entries = settle(hand("10", "7"), hand("ACE", "KING", stake=stake))
+    assert [(outcome, paid) for player, hand_, staked, outcome, paid in entries] == [(Outcome.BLACKJACK, payout)]
+    assert player.chips == payout
+
+
+def test_blackjack_against_house_blackjack_pushes():
+    """A blackjack against a house blackjack gets the stake back."""
+    player, entries = settle(hand("ACE", "QUEEN"), hand("ACE", "KING", stake=700))
+    assert [(outcome, paid) for player, hand_, staked, outcome, paid in entries] == [(Outcome.PUSH, 700)]
+
+
+@pytest.mark.parametrize("player_values, house_values, outcome, payout", [
+    (("10", "9"), ("10", "8"), Outcome.WIN, 1400),
+    (("10", "8"), ("10", "8"), Outcome.PUSH, 700),
+    (("10", "7"), ("10", "8"), Outcome.LOSE, 0),
+    (("10", "7"), ("10", "6", "9"), Outcome.WIN, 1400),
+    (("10", "6", "9"), ("10", "6", "9"), Outcome.BUST, 0),
+])
+def test_outcomes(player_values, house_values, outcome, payout):
+    """Wins pay double, pushes the stake, losses and busts nothing."""
+    player, entries = settle(hand(*house_values), hand(*player_values, stake=700))
+    assert [(settled, paid) for player, hand_, staked, settled, paid in entries] == [(outcome, payout)]
+
+
+def test_surrender_pays_half():
+    """A surrendered hand gets half of its stake back."""
+    surrendered = hand("10", "6", stake=700)
+    surrendered.is_surrendered = True
+    player, entries = settle(hand("10", "8"), surrendered)
+    assert [(outcome, paid) for player, hand_, staked, outcome, paid in entries] == [(Outcome.SURRENDER, 350)]
+
+
+def test_double_down_pays_on_doubled_stake():
+    """A doubled hand is paid on its doubled stake."""
+    doubled = hand("6", "5", stake=700)
+    doubled.double_down(CARDS[CARD_RANKS.index(VALUES.index("KING"))])
+    doubled.stake += 700
+    player, entries = settle(hand("10", "9"), doubled, chips=100)
+    assert [(staked, outcome, paid) for player, hand_, staked, outcome, paid in entries] == [(1400, Outcome.WIN, 2800)]
+    assert player.chips == 2900
+
+
+def test_split_hands_are_settled_apart():
+    """Split hands and other hands of the player are paid on their own stakes and outcomes."""
+    first = hand("8", "8", stake=700)
+    second = first.split(Hand())
+    second.stake = 700
+    first.add_card(CARDS[CARD_RANKS.index(VALUES.index("10"))])
+    second.add_card(CARDS[CARD_RANKS.index(VALUES.index("2"))])
+    natural = hand("ACE", "10", stake=700)
+    player, entries = settle(hand("10", "8"), first, second, natural)
+    assert [(outcome, paid) for player, hand_, staked, outcome, paid in entries] == [
+        (Outcome.PUSH, 700), (Outcome.LOSE, 0), (Outcome.BLACKJACK, 1750)]
+    assert player.chips == 2450
+
+
+def test_totals():
+    """The ledger adds up stakes and payouts of all rounds."""
+    ledger = Ledger(Outcome)
+    player = Player("Player", None, 0)
+    for values in (("ACE", "KING"), ("10", "7"), ("10", "9")):
+        player.hands = [hand(*values, stake=500)]
+        ledger.settle([player], hand("10", "8"))
+    assert (ledger.rounds, ledger.staked, ledger.paid) == (3, 1500, 2250)
+    assert player.chips == 2250
+    assert ledger.house_edge == pytest.approx(-0.5)
@@ -0,0 +1,113 @@
+"""Tests of OnlineDeck against the local deck API server."""
+from collections import Counter
+from random import Random
+import pytest
+import requests
+from GameOfBlackjack.deck import shoe_template
+from GameOfBlackjack.deck_server import DeckServer
+from GameOfBlackjack.online_deck import OnlineDeck
+
+
+class CountingSession(requests.Session):
+    """Session counting its calls by endpoint, failing every call after fail_after calls."""
+
+    def __init__(self, fail_after: int = None):
+        """Init."""
+        super().__init__()
+        self.calls = Counter()
+        self.fail_after = fail_after
+
+    def get(self, url, **kwargs):
+        """Count call, then make it or fail it."""
+        self.calls[url.split('?')[0].rstrip('/').rsplit('/', 1)[-1]] += 1
+        if self.fail_after is not None and sum(self.calls.values()) > self.fail_after:
+            raise requests.ConnectionError("Deck API is down!")
+        return super().get(url, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Serve the deck API locally."""
+    server = DeckServer(seed=1)
+    server.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def create_deck(server, deck_count: int = 2, fail_after: int = None, **kwargs) -> OnlineDeck:
+    """Get shuffled online deck of the server with a counting session."""
+    return OnlineDeck(deck_count, True, Random(1), base_url=server.base_url, session=CountingSession(fail_after),
+                      **kwargs)
+
+
+def draw_ids(deck: OnlineDeck, count: int) -> list:
+    """Draw count cards, get their ids."""
+    return [deck.draw_card().id for x in range(count)]
+
+
+def test_draws_shoe_in_bulk(server):
+    """A whole shoe is dealt in batches of cards."""
+    deck = create_deck(server, batch=52)
+    try:
+        assert deck.online
+        drawn = draw_ids(deck, 104)
+        assert sorted(drawn) == sorted(shoe_template(2))
+        assert deck.session.calls["draw"] == 2
+        assert deck.remaining == 0
+    finally:
+        deck.close()
+
+
+def test_refills_in_background(server):
+    """The buffer is refilled ahead of the draws once it runs low."""
+    deck = create_deck(server, batch=20, low_water=8)
+    try:
+        draw_ids(deck, 13)
+        assert deck.refill is not None
+        deck._wait_refill()
+        assert len(deck.buffer) >= deck.low_water
+        assert deck.session.calls["draw"] == 2
+        drawn = draw_ids(deck, 91)
+        assert deck.online
+        assert len(drawn) == 91 and deck.remaining == 0
+    finally:
+        deck.close()
+
+
+def test_shuffle_returns_cards(server):
+    """A shuffled online deck deals a full shoe again."""
+    deck = create_deck(server, batch=30)
+    try:
+        draw_ids(deck, 50)
+        deck.shuffle()
+        assert deck.online and deck.remaining == 104
+        assert sorted(draw_ids(deck, 104)) == sorted(shoe_template(2))
+    finally:
+        deck.close()
+
+
+@pytest.mark.parametrize("fail_after", [1, 2, 3, 5])
+def test_falls_back_to_local_pile(server, fail_after):
+    """When the API starts failing, the rest of the shoe comes from the local pile without repeating cards."""
+    deck = create_deck(server, batch=20, low_water=8, fail_after=fail_after)
+    try:
+        drawn = draw_ids(deck, 104)
+        assert not deck.online
+        assert deck.deck_id == "StoneAge"
+        assert sorted(drawn) == sorted(shoe_template(2))
+        assert deck.remaining == 0
+        deck.shuffle()
+        assert sorted(draw_ids(deck, 104)) == sorted(shoe_template(2))
+    finally:
+        deck.close()
+
+
+def test_offline_without_server():
+    """A deck that cannot reach the API deals a local shoe."""
+    deck = OnlineDeck(1, True, Random(1), base_url="http://127.0.0.1:9/api/deck/", timeout=0.5)
+    try:
+        assert not deck.online
+        assert sorted(draw_ids(deck, 52)) == sorted(shoe_template(1))
+    finally:
+        deck.close()
@@ -0,0 +1,103 @@
+"""Tests of the strategy registry."""
+import pytest
+from GameOfBlackjack.registry import StrategyRegistry, STRATEGIES
+
+SOURCES = {
+    "base": '''
+class Strategy:
+    BOT = True
+''',
+    "headers": '''
+import sample.base
+from sample.base import Strategy as Base
+
+
+class MultiLine(
+        Base,
+):
+    """Human."""
+
+    BOT = False
+
+
+class Qualified(sample.base.Strategy):
+    BOT: bool = True
+
+
+class Child(MultiLine):
+    pass
+
+
+class Chained(Qualified):
+    other = BOT = False
+
+
+class Other:
+    BOT = True
+''',
+    "texts": '''
+"""
+class InDocstring(Strategy):
+    BOT = True
+"""
+TEMPLATE = "class InString(Strategy): pass"
+
+
+class Plain:
+    """class InClassDocstring(Strategy):"""
+
+    def method(self):
+        class Nested(Strategy):
+            pass
+''',
+    "expression": '''
+import os
+from sample.base import Strategy
+
+
+class FromEnvironment(Strategy):
+    BOT = bool(os.sep)
+''',
+}
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """Registry of a package of sample sources."""
+    package = tmp_path / "sample"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    for name, source in SOURCES.items():
+        (package / f"{name}.py").write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return StrategyRegistry(str(package), "sample")
+
+
+def test_class_headers(registry):
+    """Multi-line class headers and aliased or qualified bases are found, other classes are not."""
+    index = registry.index()
+    assert {name: index[name] for name in ("MultiLine", "Qualified", "Child", "Chained")} == {
+        "MultiLine": ("headers", False), "Qualified": ("headers", True),
+        "Child": ("headers", False), "Chained": ("headers", False)}
+    assert "Other" not in index
+    assert "Strategy" not in index
+
+
+def test_class_texts_are_not_classes(registry):
+    """Classes in strings, docstrings and function bodies are not strategies."""
+    assert not registry.index().keys() & {"InDocstring", "InString", "InClassDocstring", "Nested", "Plain"}
+
+
+def test_bot_expression(registry):
+    """A BOT set to an expression is taken from the imported class."""
+    assert registry.index()["FromEnvironment"] == ("expression", True)
+    assert set(registry.bot_names) == {"Qualified", "FromEnvironment"}
+    assert registry.load("Qualified").__name__ == "Qualified"
+    with pytest.raises(KeyError):
+        registry.load("Other")
+
+
+def test_package_strategies():
+    """Strategies of this package are indexed, players that need a human are not seated as bots."""
+    assert STRATEGIES.index() == {"Karmoai": ("strategy", True), "HumanStrategy": ("strategy", False),
+                                  "OptimalAI": ("optimal_strategy", True), "RemoteStrategy": ("server", False)}
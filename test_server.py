@@ -0,0 +1,41 @@
+"""Tests of the game server."""
+import asyncio
+import threading
+import pytest
+from GameOfBlackjack.server import GameServer, Table
+from GameOfBlackjack.strategy import Karmoai
+
+
+class Failing(Karmoai):
+    """Karmoai failing on its first move."""
+
+    def play_move(self, hand):
+        """Fail."""
+        raise RuntimeError("failed move")
+
+
+def test_table_waits_without_humans():
+    """A table without humans plays no rounds and stops when closed."""
+    table = Table(0, 1, [Karmoai])
+    thread = threading.Thread(target=table.run)
+    thread.start()
+    thread.join(0.2)
+    assert thread.is_alive() and table.rounds == 0
+    table.close()
+    thread.join(1)
+    assert not thread.is_alive()
+
+
+def test_failing_table_stops_server():
+    """An exception of a table is raised from serve."""
+    async def play() -> None:
+        server = GameServer(tables=1, bots=[Failing], move_timeout=1)
+        serving = asyncio.ensure_future(server.serve(port=0))
+        while server.server is None:
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"JOIN human\n")
+        await asyncio.wait_for(serving, 5)
+
+    with pytest.raises(RuntimeError, match="failed move"):
+        asyncio.run(play())
@@ -0,0 +1,77 @@
+"""Tests of the session store."""
+from random import Random
+from GameOfBlackjack.simulation import SimulationConfig, create_table, simulate
+from GameOfBlackjack.store import SessionStore
+from GameOfBlackjack.strategy import Karmoai
+
+CONFIG = SimulationConfig(1, [Karmoai] * 3, start_coins=10 ** 4, buy_in_step=1)
+
+
+def settled_hands(table) -> list:
+    """Get (seat, hand index, outcome, score, payout in chips) of the hands of the last round."""
+    hands = []
+    for player, hand, stake, outcome, payout in table.ledger.entries:
+        seat = table.players.index(player)
+        hand_index = hands[-1][1] + 1 if hands and hands[-1][0] == seat else 0
+        hands.append((seat, hand_index, outcome, hand.score, payout))
+    return hands
+
+
+def test_round_results(tmp_path):
+    """Committed rounds read back as they were settled, rounds not committed yet are not stored."""
+    path = str(tmp_path / "store.db")
+    table = create_table(CONFIG, Random(1))
+    table.store = SessionStore(path, batch_rounds=10)
+    settled = {}
+    for x in range(25):
+        table.play_round()
+        settled[table.round_number] = settled_hands(table)
+    table.store.close()
+
+    store = SessionStore(path)
+    try:
+        for round_number in range(1, 21):
+            assert store.round_results(round_number) == settled[round_number]
+        assert store.round_results(21) == []
+    finally:
+        store.close()
+
+
+def test_resume_from_last_commit(tmp_path):
+    """A crashed session resumes with the bankrolls, round and buy in of its last committed round."""
+    path = str(tmp_path / "store.db")
+    table = create_table(CONFIG, Random(1))
+    table.store = SessionStore(path, batch_rounds=10)
+    states = {}
+    for x in range(25):
+        table.play_round()
+        states[table.round_number] = ([player.chips for player in table.players], table.buy_in_cost)
+    table.store.close()
+
+    resumed = create_table(CONFIG, Random(2))
+    store = SessionStore(path)
+    try:
+        assert store.resume(resumed) == 20
+        assert ([player.chips for player in resumed.players], resumed.buy_in_cost) == states[20]
+    finally:
+        store.close()
+
+
+def test_simulate_counts_rounds_of_the_call(tmp_path):
+    """A resumed simulation plays the rest of the session and counts only those rounds."""
+    path = str(tmp_path / "store.db")
+    store = SessionStore(path, batch_rounds=10)
+    first = simulate(CONFIG, 20, Random(1), store=store)
+    store.close()
+    assert first.rounds == 20
+
+    store = SessionStore(path, batch_rounds=10)
+    try:
+        second = simulate(CONFIG, 50, Random(2), store=store)
+    finally:
+        store.close()
+    assert second.rounds == 30
+    for player, before in zip(second.players, first.players):
+        assert player.start_coins == before.coins
+        assert player.rounds <= second.rounds
+        assert player.hands >= player.rounds
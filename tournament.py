@@ -0,0 +1,117 @@
+"""Strategy tournament."""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from GameOfBlackjack.blackjack import GameController
+from GameOfBlackjack.simulation import SimulationConfig, simulate, shard_rng, add_curves
+
+
+class StrategyStanding:
+    """Tournament results of one strategy over all its seats."""
+
+    def __init__(self, name: str):
+        """Init."""
+        self.name = name
+        self.seats = 0
+        self.rounds = 0
+        self.net = 0
+        self.ruins = 0
+        self.curve = []
+
+    @property
+    def ruin_rate(self) -> float:
+        """Get share of seats that ran out of coins."""
+        return self.ruins / self.seats if self.seats else 0.0
+
+    @property
+    def average_curve(self) -> list:
+        """Get coins of a seat over the tournament, averaged over seats."""
+        return [coins / self.seats for coins in self.curve]
+
+    def __repr__(self) -> str:
+        """Repr."""
+        return f"{self.name}: {self.net:+} coins over {self.seats} seats, ruin rate {self.ruin_rate:.1%}"
+
+
+class Tournament:
+    """Plays strategies against each other on many headless tables.
+
+    Every table seats each strategy seats_per_strategy times. Seating order rotates from table to table
+    and tables cycle through deck_counts. Table number and seed give the random stream of every table,
+    so a tournament can be replayed.
+    """
+
+    def __init__(self, strategies: list = None, tables: int = 32, rounds: int = 1000, deck_counts=range(1, 9),
+                 seats_per_strategy: int = 1, start_coins: int = GameController.PLAYER_START_COINS,
+                 buy_in_step: int = 0, penetration: float = 0.75, curve_every: int = 100, seed: int = 0):
+        """Init."""
+        self.strategies = GameController.load_strategies() if strategies is None else strategies
+        self.tables = tables
+        self.rounds = rounds
+        self.deck_counts = list(deck_counts)
+        self.seats_per_strategy = seats_per_strategy
+        self.start_coins = start_coins
+        self.buy_in_step = buy_in_step
+        self.penetration = penetration
+        self.curve_every = curve_every
+        self.seed = seed
+        self.elapsed = 0.0
+        self.total_rounds = 0
+
+    def schedule(self) -> list:
+        """Get table configs of the tournament."""
+        seats = self.strategies * self.seats_per_strategy
+        configs = []
+        for table in range(self.tables):
+            shift = table % len(seats)
+            configs.append(SimulationConfig(self.deck_counts[table % len(self.deck_counts)],
+                                            seats[shift:] + seats[:shift], self.start_coins, self.buy_in_step,
+                                            self.penetration))
+        return configs
+
+    def run(self, processes: int = None) -> dict:
+        """Play all tables in a process pool and get standings by strategy name."""
+        jobs = [(config, self.rounds, self.seed, table, self.curve_every)
+                for table, config in enumerate(self.schedule())]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(_play_table, jobs))
+        self.elapsed = time.perf_counter() - start
+        self.total_rounds = sum(result.rounds for result in results)
+        standings = {strategy.__name__: StrategyStanding(strategy.__name__) for strategy in self.strategies}
+        for result in results:
+            for player in result.players:
+                standing = standings[player.strategy]
+                standing.seats += 1
+                standing.rounds += player.rounds
+                standing.net += player.net
+                standing.ruins += player.ruins
+                standing.curve = add_curves(standing.curve, player.curve)
+        return standings
+
+    @property
+    def rounds_per_second(self) -> float:
+        """Get throughput of the last run."""
+        return self.total_rounds / self.elapsed if self.elapsed else 0.0
+
+
+def _play_table(args: tuple):
+    """Play one tournament table in a worker process."""
+    config, rounds, seed, table, curve_every = args
+    return simulate(config, rounds, shard_rng(seed, table), curve_every, table)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play discovered strategies against each other.")
+    parser.add_argument("--tables", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--seats", type=int, default=1, help="seats per strategy at every table")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    tournament = Tournament(tables=args.tables, rounds=args.rounds, seats_per_strategy=args.seats, seed=args.seed)
+    for standing in sorted(tournament.run(args.processes).values(), key=lambda s: s.net, reverse=True):
+        curve = ' '.join(f"{coins:.0f}" for coins in standing.average_curve)
+        print(f"{standing.name: <20} net {standing.net: >+10} ruin {standing.ruin_rate: >6.1%}  curve: {curve}")
+    print(f"{tournament.total_rounds} rounds on {tournament.tables} tables, "
+          f"{tournament.rounds_per_second:.0f} rounds/s")